@@ -0,0 +1,51 @@
+# benchmarks/hunger_tick.py
+#
+# Per-character update_hunger_thirst loop vs the batch tick_all.
+# Run with: python -m benchmarks.hunger_tick [count]
+
+import copy
+import random
+import sys
+import time
+
+from utils.hunger_thirst import MAX_HUNGER, MAX_THIRST, np, now_epoch, tick_all, update_hunger_thirst
+
+DEFAULT_COUNT = 100_000
+
+
+def make_characters(count, now, seed=0):
+    rng = random.Random(seed)
+    characters = {}
+    for i in range(count):
+        # Mix of recently active players and ones offline for days.
+        offline = rng.randint(0, 60 * 60 * 24 * 7)
+        characters[str(i)] = {
+            "hunger": rng.randint(0, MAX_HUNGER),
+            "thirst": rng.randint(0, MAX_THIRST),
+            "last_tick": now - offline,
+        }
+    return characters
+
+
+def main(count):
+    now = now_epoch()
+    characters = make_characters(count, now)
+    looped = copy.deepcopy(characters)
+
+    start = time.perf_counter()
+    for char in looped.values():
+        update_hunger_thirst(char, now)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    changed = tick_all(characters, now)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    assert characters == looped, "batch tick diverged from update_hunger_thirst"
+    print(f"📊 {count:,} characters ({'numpy' if np is not None else 'pure python'})")
+    print(f"  per-character loop {loop_ms:10.1f} ms")
+    print(f"  tick_all           {batch_ms:10.1f} ms  ({len(changed):,} changed)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
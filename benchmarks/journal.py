@@ -0,0 +1,97 @@
+# benchmarks/journal.py
+#
+# Append throughput and startup recovery time for the journal backend.
+# Run with: python -m benchmarks.journal [characters]
+#
+# Appends: batches of typed events (transfers and loot grants) written with
+# one fsync per batch, compared with the whole-file JSON save every change
+# costs on the json backend.
+# Recovery: loading the snapshot plus journal tails of increasing length.
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.storage_backends import RESOURCES, make_characters
+from utils.journal import JournalStorage, item_transferred, loot_granted
+from utils.storage import JsonStorage
+
+DEFAULT_COUNT = 10_000
+BATCH_SIZES = [1, 10, 100, 1_000]
+TAIL_LENGTHS = [0, 1_000, 10_000, 100_000]
+APPENDED_EVENTS = 2_000
+
+
+def make_events(characters, count, seed=0):
+    rng = random.Random(seed)
+    ids = list(characters)
+    events = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            events.append(item_transferred(rng.choice(ids), rng.choice(ids), rng.choice(RESOURCES), 1))
+        else:
+            events.append(loot_granted(rng.choice(ids), [(rng.choice(RESOURCES), rng.randint(1, 3))]))
+    return events
+
+
+def open_journal(tmp, compact_every=10**12):
+    return JournalStorage(
+        os.path.join(tmp, "characters.json"),
+        os.path.join(tmp, "base.json"),
+        os.path.join(tmp, "journal.jsonl"),
+        compact_every=compact_every,
+    )
+
+
+def bench_appends(count):
+    print("  appends (one fsync per batch):")
+    characters, base = make_characters(count)
+    for batch in BATCH_SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = open_journal(tmp)
+            events = make_events(characters, max(APPENDED_EVENTS, batch))
+            start = time.perf_counter()
+            for i in range(0, len(events), batch):
+                storage.save(characters, base, records=events[i:i + batch])
+            elapsed = time.perf_counter() - start
+        print(f"    batch {batch:>5}  {len(events) / elapsed:12,.0f} events/s  "
+              f"{elapsed / (len(events) / batch) * 1000:8.2f} ms per flush")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(os.path.join(tmp, "characters.json"), os.path.join(tmp, "base.json"))
+        some_id = next(iter(characters))
+        start = time.perf_counter()
+        storage.save(characters, base, [some_id])
+        elapsed = time.perf_counter() - start
+    print(f"    json backend: {elapsed * 1000:.1f} ms per flush of any change ({count:,} characters)")
+
+
+def bench_recovery(count):
+    print("  recovery (snapshot + journal tail):")
+    for tail in TAIL_LENGTHS:
+        with tempfile.TemporaryDirectory() as tmp:
+            characters, base = make_characters(count)
+            storage = open_journal(tmp, compact_every=0)
+            storage.save(characters, base, [*characters, "base"])  # compacts into a snapshot
+
+            storage.compact_every = 10**12
+            events = make_events(characters, tail, seed=1)
+            for i in range(0, len(events), 1_000):
+                storage.save(characters, base, records=events[i:i + 1_000])
+
+            start = time.perf_counter()
+            open_journal(tmp).load()
+            elapsed = time.perf_counter() - start
+        print(f"    tail {tail:>7,}  {elapsed * 1000:10.1f} ms")
+
+
+def main(count):
+    print(f"📊 {count:,} characters")
+    bench_appends(count)
+    bench_recovery(count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
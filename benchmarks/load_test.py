@@ -0,0 +1,466 @@
+# benchmarks/load_test.py
+#
+# Offline load test: drives the real cogs with stub Discord objects.
+# Run with: python -m benchmarks.load_test [--players N] [--ops N] [--mode reactions|buttons] ...
+#
+# Every simulated player creates a character and then replays a weighted mix
+# of commands (see COMMAND_MIX) concurrently with everyone else, against a
+# temporary data directory. Rolls go through the full flow: the command, a
+# few Add/Reroll clicks (reactions through the ReactionRouter or button
+# callbacks), and the submit. Group actions run a lobby, joins, launch and
+# every member's submit.
+#
+# Nothing touches the network: Interaction, Message, Reaction and User are
+# stubs that count the API calls they would have made, optionally sleeping
+# --api-latency ms to mimic REST round trips.
+#
+# Players get a fresh daily action before every roll so the mix isn't
+# dominated by "already did an action today" replies.
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import discord
+from discord.ext import commands
+
+from utils.constants import BACKGROUNDS
+from utils.reactions import ReactionRouter
+from utils.render import RENDER_WINDOW, RenderScheduler
+from utils.repository import CharacterRepository
+from utils.journal import JournalStorage
+from utils.storage import JsonStorage, SqliteStorage
+from utils.timings import IO_TIMINGS, Timings
+
+EXTENSIONS = [
+    "cogs.hunger_thirst",
+    "cogs.group_actions",
+    "cogs.actions",
+    "cogs.character",
+    "cogs.inventory",
+    "cogs.camp",
+]
+
+# command -> relative weight
+COMMAND_MIX = {
+    "check": 20,
+    "eat": 8,
+    "drink": 8,
+    "give": 10,
+    "store": 8,
+    "take": 6,
+    "storage": 8,
+    "equip": 6,
+    "do_action": 20,
+    "group_action": 6,
+    "camp_report": 2,
+}
+
+STARTING_SUPPLIES = {"food": 20, "water": 20, "materials": 10}
+ADD, REROLL, SUBMIT, JOIN, LAUNCH = "➕", "🔁", "✅", "✅", "🚀"
+BLOCK_THRESHOLD = 0.010  # seconds of loop lag that count as a stall
+MONITOR_INTERVAL = 0.005
+
+_snowflakes = itertools.count(10**18)
+
+
+# --- Stub Discord objects ---
+
+class ApiCounter:
+    """Counts the REST calls the stubs would have made."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = Counter()
+
+    async def call(self, name):
+        self.calls[name] += 1
+        await asyncio.sleep(self.latency)
+
+
+class StubAsset:
+    def __init__(self, url):
+        self.url = url
+
+
+class StubUser:
+    def __init__(self, user_id, name):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+        self.display_avatar = StubAsset(f"https://example.invalid/{user_id}.png")
+        self.avatar = self.display_avatar
+
+    def __str__(self):
+        return self.name
+
+
+class StubMessage:
+    def __init__(self, api, channel, content=None, embed=None, view=None):
+        self.api = api
+        self.id = next(_snowflakes)
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.view = view
+
+    async def add_reaction(self, emoji):
+        await self.api.call("add_reaction")
+
+    async def remove_reaction(self, emoji, user):
+        await self.api.call("remove_reaction")
+
+    async def edit(self, embed=None, view=None, **kwargs):
+        await self.api.call("edit_message")
+        self.embed = embed or self.embed
+        self.view = view
+
+    async def delete(self):
+        await self.api.call("delete_message")
+
+
+class StubChannel:
+    def __init__(self, api):
+        self.api = api
+        self.id = next(_snowflakes)
+        self.messages = []
+
+    async def send(self, content=None, embed=None, view=None, delete_after=None, **kwargs):
+        await self.api.call("send_message")
+        message = StubMessage(self.api, self, content, embed, view)
+        self.messages.append(message)
+        return message
+
+
+class StubResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def send_message(self, content=None, embed=None, view=None, ephemeral=False, **kwargs):
+        await self.interaction.api.call("interaction_response")
+        self.done = True
+        self.interaction.message = StubMessage(self.interaction.api, self.interaction.channel, content, embed, view)
+
+    async def edit_message(self, embed=None, view=None, **kwargs):
+        await self.interaction.api.call("interaction_response")
+        self.done = True
+        self.interaction.message = StubMessage(self.interaction.api, self.interaction.channel, embed=embed, view=view)
+
+    async def defer(self, **kwargs):
+        await self.interaction.api.call("interaction_response")
+        self.done = True
+
+
+class StubFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, content=None, embed=None, view=None, ephemeral=False, **kwargs):
+        await self.interaction.api.call("followup")
+        return StubMessage(self.interaction.api, self.interaction.channel, content, embed, view)
+
+
+class StubInteraction:
+    def __init__(self, api, user, channel):
+        self.api = api
+        self.id = next(_snowflakes)
+        self.user = user
+        self.channel = channel
+        self.response = StubResponse(self)
+        self.followup = StubFollowup(self)
+        self.message = None
+
+    async def original_response(self):
+        await self.api.call("original_response")
+        return self.message
+
+    async def edit_original_response(self, embed=None, view=None, **kwargs):
+        await self.api.call("edit_message")
+        self.message.embed = embed or self.message.embed
+        self.message.view = view
+
+
+class StubReaction:
+    """Shaped like discord.RawReactionActionEvent, which is what the router receives."""
+
+    def __init__(self, message, user, emoji):
+        self.message_id = message.id
+        self.channel_id = message.channel.id
+        self.user_id = user.id
+        self.member = user
+        self.emoji = emoji
+
+
+# --- Harness ---
+
+class LoadTest:
+    def __init__(self, args, data_dir):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.api = ApiCounter(args.api_latency / 1000)
+        self.latency = Timings(max_samples=10**7)
+        self.errors = Counter()
+        self.camp_problems = []
+        self.players = [StubUser(10**17 + i, f"Survivor {i}") for i in range(args.players)]
+        self.users = {player.id: player for player in self.players}
+
+        if args.storage == "sqlite":
+            storage = SqliteStorage(os.path.join(data_dir, "bathala.db"))
+        elif args.storage == "journal":
+            storage = JournalStorage(
+                os.path.join(data_dir, "characters.json"),
+                os.path.join(data_dir, "base.json"),
+                os.path.join(data_dir, "journal.jsonl"),
+            )
+        else:
+            storage = JsonStorage(os.path.join(data_dir, "characters.json"), os.path.join(data_dir, "base.json"))
+
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.default(), max_messages=None)
+        bot.repo = CharacterRepository(storage=storage, flush_interval=args.flush_interval)
+        bot.renderer = RenderScheduler(args.render_window)
+        bot.reactions = ReactionRouter(bot)
+        bot.interaction_mode = args.mode
+        bot.group_loot_rule = args.group_loot
+
+        async def fetch_user(user_id):
+            await self.api.call("fetch_user")
+            return self.users[user_id]
+
+        bot.fetch_user = fetch_user
+        self.bot = bot
+
+    def interaction(self, user, channel=None):
+        return StubInteraction(self.api, user, channel or StubChannel(self.api))
+
+    async def invoke(self, command_name, user, channel=None, **kwargs):
+        """Run a slash command callback the way the command tree would."""
+        command = self.bot.tree.get_command(command_name)
+        interaction = self.interaction(user, channel)
+        with self.latency.time(command_name):
+            await command.callback(command.binding, interaction, **kwargs)
+        return interaction
+
+    async def react(self, message, user, emoji, op):
+        with self.latency.time(op):
+            await self.bot.reactions.on_raw_reaction_add(StubReaction(message, user, emoji))
+
+    async def click(self, view, item_name, user, op, channel=None):
+        interaction = self.interaction(user, channel)
+        with self.latency.time(op):
+            if await view.interaction_check(interaction):
+                await getattr(view, item_name).callback(interaction)
+        return interaction
+
+    def fresh_day(self, *users):
+        for user in users:
+            char = self.bot.repo.get(str(user.id))
+            if char is not None:
+                char.pop("last_action_day", None)
+
+    # --- Scenarios ---
+
+    async def setup_player(self, player):
+        await self.invoke("create_character", player, name=player.name, background=self.rng.choice(list(BACKGROUNDS)))
+        await self.invoke("allocate_skills", player, scavenging=3, crafting=2)
+        inventory = self.bot.repo.get(str(player.id))["inventory"]
+        for item, amount in STARTING_SUPPLIES.items():
+            inventory.add(item, amount)
+        self.bot.repo.mark_inventory_dirty(str(player.id))
+
+    def roll_clicks(self):
+        return [self.rng.choice((ADD, REROLL)) for _ in range(self.rng.randint(0, 3))]
+
+    async def solo_action(self, player):
+        self.fresh_day(player)
+        interaction = await self.invoke("do_action", player, action="scavenge")
+        message = interaction.message
+
+        if self.args.mode == "buttons":
+            view = message.view
+            for emoji in self.roll_clicks():
+                await self.click(view, "add_die" if emoji == ADD else "reroll", player, "roll_click")
+            await self.click(view, "submit", player, "roll_submit")
+            return
+
+        for emoji in self.roll_clicks():
+            await self.react(message, player, emoji, "roll_click")
+        await self.react(message, player, SUBMIT, "roll_submit")
+
+    async def group_action(self, leader):
+        others = [p for p in self.players if p is not leader]
+        members = self.rng.sample(others, min(len(others), self.rng.randint(1, self.args.group_size - 1)))
+        self.fresh_day(leader, *members)
+
+        channel = StubChannel(self.api)
+        interaction = await self.invoke("group_action", leader, channel, action="scavenge")
+        lobby = interaction.message
+
+        if self.args.mode == "buttons":
+            view = lobby.view
+            for member in members:
+                await self.click(view, "join", member, "group_join", channel)
+            launched = await self.click(view, "launch", leader, "group_launch", channel)
+            roll_view = launched.message.view
+            if roll_view is None:
+                return
+            for user in [leader, *members]:
+                for emoji in self.roll_clicks()[:1]:
+                    await self.click(roll_view, "add_die" if emoji == ADD else "reroll", user, "roll_click", channel)
+                await self.click(roll_view, "submit", user, "group_submit", channel)
+            return
+
+        for member in members:
+            await self.react(lobby, member, JOIN, "group_join")
+        sent = len(channel.messages)
+        await self.react(lobby, leader, LAUNCH, "group_launch")
+        rolls = [m for m in channel.messages[sent:] if m.embed is not None]
+        if not rolls:
+            return
+        roll_message = rolls[-1]
+        for user in [leader, *members]:
+            for emoji in self.roll_clicks()[:1]:
+                await self.react(roll_message, user, emoji, "roll_click")
+            await self.react(roll_message, user, SUBMIT, "group_submit")
+
+    async def run_command(self, player, name):
+        if name == "do_action":
+            await self.solo_action(player)
+        elif name == "group_action":
+            await self.group_action(player)
+        elif name in ("eat", "drink"):
+            await self.invoke(name, player, amount=1)
+        elif name == "give":
+            target = self.rng.choice(self.players)
+            await self.invoke("give", player, target=target, item="food", amount=1)
+        elif name in ("store", "take"):
+            await self.invoke(name, player, item=self.rng.choice(list(STARTING_SUPPLIES)), amount=1)
+        elif name == "equip":
+            inventory = self.bot.repo.get(str(player.id))["inventory"]
+            equipped = inventory.equipped_items()
+            if equipped:
+                await self.invoke("unequip", player, item=equipped[0][0])
+            else:
+                carried = inventory.carried_items()
+                await self.invoke("equip", player, item=self.rng.choice(carried)[0])
+        else:
+            await self.invoke(name, player)
+
+    async def run_player(self, player):
+        names = list(COMMAND_MIX)
+        weights = list(COMMAND_MIX.values())
+        for _ in range(self.args.ops):
+            name = self.rng.choices(names, weights)[0]
+            try:
+                await self.run_command(player, name)
+            except Exception as e:
+                self.errors[f"{name}: {type(e).__name__}: {e}"] += 1
+            if self.args.think:
+                await asyncio.sleep(self.rng.uniform(0, self.args.think / 1000))
+
+
+async def monitor_loop(stats):
+    """Measure how late the event loop wakes a sleeper; lateness is time spent blocked."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(MONITOR_INTERVAL)
+        lag = time.perf_counter() - start - MONITOR_INTERVAL
+        stats["max"] = max(stats["max"], lag)
+        if lag > BLOCK_THRESHOLD:
+            stats["blocked"] += lag
+            stats["stalls"] += 1
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as data_dir:
+        log = sys.stdout if args.verbose else open(os.devnull, "w")
+        with contextlib.redirect_stdout(log):
+            test = LoadTest(args, data_dir)
+            bot = test.bot
+            async with bot:
+                bot.repo.start()
+                for extension in EXTENSIONS:
+                    await bot.load_extension(extension)
+
+                await asyncio.gather(*(test.setup_player(p) for p in test.players))
+                test.latency = Timings(max_samples=10**7)
+                test.api.calls.clear()
+                IO_TIMINGS.samples.clear()
+
+                loop_stats = {"blocked": 0.0, "stalls": 0, "max": 0.0}
+                monitor = asyncio.create_task(monitor_loop(loop_stats))
+                start = time.perf_counter()
+                await asyncio.gather(*(test.run_player(p) for p in test.players))
+                wall = time.perf_counter() - start
+                monitor.cancel()
+                test.camp_problems = bot.repo.camp.verify()
+
+                for extension in EXTENSIONS:
+                    await bot.unload_extension(extension)
+            await bot.repo.close()
+        if log is not sys.stdout:
+            log.close()
+
+    report(args, test, wall, loop_stats)
+    return not test.errors and not test.camp_problems
+
+
+def report(args, test, wall, loop_stats):
+    ops = args.players * args.ops
+    print(f"📊 Load test: {args.players} players x {args.ops} ops, mode={args.mode}, storage={args.storage}, "
+          f"api latency {args.api_latency:g} ms")
+    print(f"  wall {wall:.2f} s | {ops} ops | {ops / wall:,.1f} ops/s")
+    print("  latency per command:")
+    for line in test.latency.format().splitlines():
+        print(f"    {line}")
+    print(f"  event loop: blocked {loop_stats['blocked'] * 1000:.1f} ms over {loop_stats['stalls']} stall(s) "
+          f"> {BLOCK_THRESHOLD * 1000:.0f} ms, worst lag {loop_stats['max'] * 1000:.1f} ms")
+    total_calls = sum(test.api.calls.values())
+    breakdown = ", ".join(f"{name} {count}" for name, count in test.api.calls.most_common())
+    print(f"  api calls: {total_calls} ({breakdown})")
+    print("  io:")
+    for line in IO_TIMINGS.format().splitlines():
+        print(f"    {line}")
+    if test.camp_problems:
+        print("  ❌ camp index out of sync with a full rescan:")
+        for problem in test.camp_problems:
+            print(f"    {problem}")
+    else:
+        print("  camp index: consistent with a full rescan")
+    if test.errors:
+        print("  ❌ errors:")
+        for error, count in test.errors.most_common():
+            print(f"    {count}x {error}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Offline load test for the Bathala cogs.")
+    parser.add_argument("--players", type=int, default=50, help="concurrent simulated players")
+    parser.add_argument("--ops", type=int, default=20, help="commands per player")
+    parser.add_argument("--mode", choices=("reactions", "buttons"), default="reactions")
+    parser.add_argument("--storage", choices=("json", "sqlite", "journal"), default="json")
+    parser.add_argument("--group-size", type=int, default=4, help="max members per group action")
+    parser.add_argument("--group-loot", choices=("base", "members"), default="base")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="simulated ms per Discord API call")
+    parser.add_argument("--render-window", type=float, default=RENDER_WINDOW, help="embed edit debounce, seconds")
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="repository flush interval, seconds")
+    parser.add_argument("--think", type=float, default=0.0, help="max random pause between a player's commands, ms")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="show the cogs' own logging")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run(parse_args(sys.argv[1:]))) else 1)
@@ -0,0 +1,93 @@
+# benchmarks/loot_sampler.py
+#
+# Timing and distribution check for roll_loot.
+# Run with: python -m benchmarks.loot_sampler [draws]
+#
+# The distribution check compares observed item frequencies with the
+# probabilities implied by LOOT_TABLE using a chi-square statistic, and fails
+# if it exceeds the 99.9% critical value.
+
+import math
+import random
+import sys
+import time
+from collections import Counter
+
+from utils.items import LOOT_TABLE, NUMPY_LOOT_THRESHOLD, np, roll_loot
+
+DEFAULT_DRAWS = 200_000
+
+
+def expected_probabilities():
+    total = sum(data["weight"] for data in LOOT_TABLE.values())
+    probs = Counter()
+    for data in LOOT_TABLE.values():
+        for item in data["items"]:
+            probs[item["name"]] += data["weight"] / total / len(data["items"])
+    return probs
+
+
+def chi_square_critical(dof, z=3.090):
+    # Wilson-Hilferty approximation; z=3.090 is the 99.9th normal percentile.
+    return dof * (1 - 2 / (9 * dof) + z * math.sqrt(2 / (9 * dof))) ** 3
+
+
+def check_distribution(loot, label):
+    probs = expected_probabilities()
+    observed = Counter(name for name, _ in loot)
+    draws = len(loot)
+    statistic = sum((observed[name] - p * draws) ** 2 / (p * draws) for name, p in probs.items())
+    critical = chi_square_critical(len(probs) - 1)
+    status = "✅" if statistic < critical else "❌"
+    print(f"  {status} {label:<12} chi²={statistic:8.2f} (critical {critical:.2f}, {draws:,} draws)")
+    return statistic < critical
+
+
+def legacy_roll_loot(successes):
+    """The per-success loop roll_loot used before the alias sampler."""
+    results = []
+    for _ in range(successes):
+        rarities = list(LOOT_TABLE.keys())
+        weights = [LOOT_TABLE[r]["weight"] for r in rarities]
+        rarity = random.choices(rarities, weights=weights, k=1)[0]
+        entry = random.choice(LOOT_TABLE[rarity]["items"])
+        if "amount" in entry:
+            results.append((entry["name"], random.randint(*entry["amount"])))
+        else:
+            results.append((entry["name"], 1))
+    return results
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(draws):
+    print(f"📊 {draws:,} draws")
+    _, legacy_ms = timed(legacy_roll_loot, draws)
+    print(f"  legacy loop  {legacy_ms:10.1f} ms")
+
+    python_loot, python_ms = timed(roll_loot, min(draws, NUMPY_LOOT_THRESHOLD - 1))
+    per_draw = python_ms / len(python_loot) * draws
+    print(f"  alias python {per_draw:10.1f} ms (extrapolated from {len(python_loot)} draws)")
+
+    ok = True
+    if np is not None:
+        numpy_loot, numpy_ms = timed(roll_loot, draws)
+        print(f"  alias numpy  {numpy_ms:10.1f} ms")
+        ok &= check_distribution(numpy_loot, "numpy path")
+    else:
+        print("  (NumPy not installed; skipping numpy path)")
+
+    # Many small batches exercise the pure-Python path end to end.
+    small_batches = []
+    for _ in range(draws // 50):
+        small_batches.extend(roll_loot(50))
+    ok &= check_distribution(small_batches, "python path")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DRAWS) else 1)
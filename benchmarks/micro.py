@@ -0,0 +1,310 @@
+# benchmarks/micro.py
+#
+# Micro-benchmarks for the utils hot paths, with machine-readable baselines.
+# Run with: python -m benchmarks.micro [--save] [--check] [--only SUBSTRING] [--sizes N ...]
+#
+# Every case reports the best per-call time over several repeats. Results are
+# compared with benchmarks/baselines/micro.json when it exists; --save writes
+# the current run there, and --check exits non-zero if any case got slower
+# than the baseline by more than --tolerance.
+#
+# Baselines are only comparable on the same machine and Python build; the
+# file records both so a mismatch is easy to spot.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+from types import SimpleNamespace
+
+from benchmarks.storage_backends import make_characters
+from utils.actions import ACTIONS
+from utils.hunger_thirst import MAX_HUNGER, MAX_THIRST, SECONDS_PER_HOUR, now_epoch, update_hunger_thirst
+from utils.inventory import Stash, remove_item, transfer_item
+from utils.items import ITEM_REGISTRY, ITEMS, np, normalize_item_name, roll_loot
+from utils.rolls import BASE_DICE, DicePool, calculate_successes, format_grouproll_embed, format_roll_embed, reroll_lowest
+from utils.storage import JsonStorage
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+DEFAULT_TOLERANCE = 0.25
+INVENTORY_SIZES = [10, 100, 1_000, 10_000]
+DEFAULT_JSON_SIZES = [1_000, 10_000, 100_000]
+
+CASES = []  # (name, setup) where setup() returns the callable to time
+
+
+def case(name):
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+def measure(fn, repeat=5, min_time=0.05):
+    """Best seconds per call, with the loop count picked by timeit's autorange."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=number))
+    return best / number, number
+
+
+# --- Inventory ---
+
+def make_stash(entries, rng):
+    names = [f"Item {i}" for i in range(entries)]
+    stash = Stash()
+    for name in names:
+        stash.add(name, rng.randint(1, 5), equipped=rng.random() < 0.1)
+    return stash, names
+
+
+def inventory_cases(size):
+    @case(f"transfer_item[{size}]")
+    def transfer_setup():
+        rng = random.Random(size)
+        giver, names = make_stash(size, rng)
+        receiver, _ = make_stash(size, rng)
+        characters = {"a": {"inventory": giver}, "b": {"inventory": receiver}}
+        items = [rng.choice(names) for _ in range(64)]
+        picks = iter(range(10**12))
+
+        def run():
+            item = items[next(picks) % len(items)]
+            transfer_item(characters, "a", "b", item)
+            transfer_item(characters, "b", "a", item)
+        return run
+
+    @case(f"remove_item[{size}]")
+    def remove_setup():
+        rng = random.Random(size)
+        stash, names = make_stash(size, rng)
+        entity = {"inventory": stash}
+        items = [rng.choice(names) for _ in range(64)]
+        picks = iter(range(10**12))
+
+        def run():
+            item = items[next(picks) % len(items)]
+            remove_item(entity, item)
+            stash.add(item)
+        return run
+
+
+# --- Items and loot ---
+
+NORMALIZE_NAMES = list(ITEMS) + [f"E:{name}" for name in ITEMS] + ["food", "Water", "MATERIALS"]
+
+@case(f"normalize_item_name[{len(NORMALIZE_NAMES)} names]")
+def normalize_setup():
+    return lambda: [normalize_item_name(name) for name in NORMALIZE_NAMES]
+
+@case(f"ITEM_REGISTRY.find[{len(NORMALIZE_NAMES)} names]")
+def registry_setup():
+    return lambda: [ITEM_REGISTRY.find(name) for name in NORMALIZE_NAMES]
+
+
+def loot_cases():
+    for successes in (1, 10, 100, 1_000):
+        @case(f"roll_loot[{successes}]")
+        def loot_setup(successes=successes):
+            return lambda: roll_loot(successes)
+
+
+# --- Dice ---
+
+def dice_cases():
+    for dice in (BASE_DICE, 50, 500):
+        @case(f"calculate_successes[{dice}]")
+        def successes_setup(dice=dice):
+            rolls = [random.randint(1, 6) for _ in range(dice)]
+            return lambda: calculate_successes(rolls)
+
+        @case(f"reroll_lowest[{dice}]")
+        def reroll_setup(dice=dice):
+            rolls = [random.randint(1, 6) for _ in range(dice)]
+            return lambda: reroll_lowest(rolls, [])
+
+        @case(f"DicePool.reroll_lowest[{dice}]")
+        def pool_reroll_setup(dice=dice):
+            pool = DicePool.roll(dice)
+            return pool.reroll_lowest
+
+
+# --- Hunger and thirst ---
+
+HUNGER_BATCH = 256
+
+@case(f"update_hunger_thirst[{HUNGER_BATCH} chars]")
+def hunger_setup():
+    now = now_epoch()
+    rng = random.Random(0)
+    characters = [
+        {"hunger": MAX_HUNGER, "thirst": MAX_THIRST, "last_tick": now - rng.randint(0, 48) * SECONDS_PER_HOUR}
+        for _ in range(HUNGER_BATCH)
+    ]
+    ticks = [char["last_tick"] for char in characters]
+
+    def run():
+        for char, tick in zip(characters, ticks):
+            char["last_tick"] = tick
+            update_hunger_thirst(char, now)
+    return run
+
+
+# --- Embeds ---
+
+def fake_user(user_id):
+    return SimpleNamespace(id=user_id, display_name=f"Survivor {user_id}", mention=f"<@{user_id}>")
+
+
+def embed_cases():
+    action = ACTIONS["scavenge"]
+
+    for dice in (BASE_DICE, 50):
+        @case(f"format_roll_embed[{dice} dice]")
+        def roll_embed_setup(dice=dice):
+            pool = DicePool.roll(dice)
+            for _ in range(3):
+                pool.reroll_lowest()
+            user = fake_user(1)
+            return lambda: format_roll_embed(user, action, pool, "Scavenging", 5)
+
+    for size in (4, 25, 100):
+        @case(f"format_grouproll_embed[{size} members]")
+        def group_embed_setup(size=size):
+            members = {i: {"user": fake_user(i), "skill_points": 3} for i in range(size)}
+            pool = DicePool.roll(BASE_DICE * size)
+            for _ in range(3):
+                pool.reroll_lowest()
+            submitted = set(range(0, size, 2))
+            return lambda: format_grouproll_embed(action, pool, members, submitted)
+
+
+# --- JSON storage ---
+
+def json_cases(sizes, scratch_dir):
+    for size in sizes:
+        @case(f"json_save[{size}]")
+        def save_setup(size=size):
+            tmp = tempfile.mkdtemp(dir=scratch_dir)
+            storage = JsonStorage(os.path.join(tmp, "characters.json"), os.path.join(tmp, "base.json"))
+            characters, base = make_characters(size)
+            ids = list(characters) + ["base"]
+            return lambda: storage.save(characters, base, ids)
+
+        @case(f"json_load[{size}]")
+        def load_setup(size=size):
+            tmp = tempfile.mkdtemp(dir=scratch_dir)
+            storage = JsonStorage(os.path.join(tmp, "characters.json"), os.path.join(tmp, "base.json"))
+            characters, base = make_characters(size)
+            storage.save(characters, base, list(characters) + ["base"])
+            return storage.load
+
+
+def build_cases(json_sizes, scratch_dir):
+    for size in INVENTORY_SIZES:
+        inventory_cases(size)
+    loot_cases()
+    dice_cases()
+    embed_cases()
+    json_cases(json_sizes, scratch_dir)
+
+
+# --- Baselines ---
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:8.2f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.2f} µs"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the utils hot paths.")
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any case regressed")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_JSON_SIZES, help="characters.json sizes")
+    args = parser.parse_args(argv)
+
+    scratch = tempfile.TemporaryDirectory()
+    build_cases(args.sizes, scratch.name)
+    baseline = load_baseline(args.baseline)
+    previous = baseline["results"] if baseline else {}
+    if baseline and baseline["environment"] != environment():
+        print(f"⚠️ Baseline was recorded on {baseline['environment']}; comparisons may not be meaningful.")
+
+    results = {}
+    regressions = []
+    devnull = open(os.devnull, "w")  # embed formatters and I/O helpers log to stdout
+    print(f"📊 {'case':<36} {'per call':>11} {'loops':>9} {'vs baseline':>12}")
+    for name, setup in CASES:
+        if args.only and args.only not in name:
+            continue
+        with contextlib.redirect_stdout(devnull):
+            fn = setup()
+            fn()  # warm caches (odds tables, loot sampler) outside the timed loops
+            per_call, number = measure(fn, repeat=3 if name.startswith("json_") else 5)
+        results[name] = {"seconds_per_call": per_call, "loops": number}
+
+        change = ""
+        if name in previous:
+            ratio = per_call / previous[name]["seconds_per_call"]
+            change = f"{(ratio - 1) * 100:+10.1f}%"
+            if ratio > 1 + args.tolerance:
+                regressions.append(name)
+                change += " ❌"
+        print(f"  {name:<36} {format_time(per_call)} {number:>9} {change:>12}")
+
+    devnull.close()
+    scratch.cleanup()
+
+    if args.save:
+        if args.only and previous:
+            results = {**previous, **results}
+        save_baseline(args.baseline, results)
+        print(f"💾 Saved baseline to {args.baseline}")
+
+    if regressions:
+        print(f"❌ {len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+    return not (args.check and regressions)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(sys.argv[1:]) else 1)
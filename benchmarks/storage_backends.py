@@ -0,0 +1,77 @@
+# benchmarks/storage_backends.py
+#
+# Compare the JSON and SQLite storage backends.
+# Run with: python -m benchmarks.storage_backends [sizes...]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from utils.constants import BACKGROUNDS, get_default_character
+from utils.inventory import Stash, transfer_item
+from utils.storage import JsonStorage, SqliteStorage
+
+DEFAULT_SIZES = [100, 10_000, 100_000]
+RESOURCES = ["food", "water", "materials", "ammo", "medicine", "fuel"]
+
+
+def make_characters(count, seed=0):
+    rng = random.Random(seed)
+    characters = {}
+    for i in range(count):
+        background = rng.choice(list(BACKGROUNDS))
+        char = get_default_character()
+        char["name"] = f"Survivor {i}"
+        char["background"] = background
+        char["inventory"] = Stash.from_data(
+            BACKGROUNDS[background]["equipment"] + rng.choices(RESOURCES, k=rng.randint(0, 20))
+        )
+        characters[str(10**17 + i)] = char
+    base = {"inventory": Stash.from_data(rng.choices(RESOURCES, k=200))}
+    return characters, base
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_backend(name, storage, characters, base):
+    ids = list(characters)
+    giver, receiver = ids[0], ids[-1]
+
+    full_save = timed(storage.save, characters, base, ids + ["base"], ())
+    load = timed(storage.load)
+
+    # A /give: two inventories change.
+    characters[giver]["inventory"].add("food", 2)
+    transfer_item(characters, giver, receiver, "food")
+    give = timed(storage.save, characters, base, (), (giver, receiver))
+
+    # A /store: one inventory plus the base stash.
+    transfer_item(characters, giver, "base", "food", base=base)
+    store = timed(storage.save, characters, base, (), (giver, "base"))
+
+    print(f"  {name:<7} full save {full_save:10.1f} ms | load {load:10.1f} ms | "
+          f"/give flush {give:8.2f} ms | /store flush {store:8.2f} ms")
+
+
+def main(sizes):
+    for size in sizes:
+        print(f"📊 {size:,} characters")
+        with tempfile.TemporaryDirectory() as tmp:
+            characters, base = make_characters(size)
+            json_storage = JsonStorage(os.path.join(tmp, "characters.json"), os.path.join(tmp, "base.json"))
+            bench_backend("json", json_storage, characters, base)
+
+            characters, base = make_characters(size)
+            sqlite_storage = SqliteStorage(os.path.join(tmp, "bathala.db"))
+            bench_backend("sqlite", sqlite_storage, characters, base)
+            sqlite_storage.close()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -2,10 +2,34 @@
 import discord
 from discord.ext import commands
 import asyncio
+import os
+
+from utils.action_handler import GROUP_LOOT_RULES
+from utils.reactions import ReactionRouter
+from utils.render import RenderScheduler
+from utils.repository import CharacterRepository, DEFAULT_FLUSH_INTERVAL
+from utils.storage import open_storage
 
 intents = discord.Intents.default()
 intents.message_content = True  # Needed for legacy commands
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Reactions are routed from raw events (utils/reactions.py), so the message cache can stay small
+bot = commands.Bot(
+    command_prefix="!",
+    intents=intents,
+    max_messages=int(os.getenv("BATHALA_MAX_MESSAGES", 100))
+)
+bot.repo = CharacterRepository(
+    storage=open_storage(os.getenv("BATHALA_STORAGE", "json")),  # "json", "sqlite" or "journal"
+    flush_interval=int(os.getenv("BATHALA_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL))
+)
+bot.renderer = RenderScheduler()
+bot.reactions = ReactionRouter(bot)
+bot.add_listener(bot.reactions.on_raw_reaction_add)
+bot.interaction_mode = os.getenv("BATHALA_INTERACTION_MODE", "reactions")  # "reactions" or "buttons"
+bot.group_loot_rule = os.getenv("BATHALA_GROUP_LOOT", "base")  # "base" or "members"
+if bot.group_loot_rule not in GROUP_LOOT_RULES:
+    # Checked here: a bad rule would otherwise only fail when a group roll settles
+    raise SystemExit(f"❌ Unknown BATHALA_GROUP_LOOT '{bot.group_loot_rule}'. Choose from: {', '.join(GROUP_LOOT_RULES)}")
 
 @bot.event
 async def on_ready():
@@ -15,12 +39,17 @@ async def on_ready():
 
 async def main():
     async with bot:
+        bot.repo.start()
         await bot.load_extension("cogs.hunger_thirst")
         await bot.load_extension("cogs.group_actions")
         await bot.load_extension("cogs.actions")
         await bot.load_extension("cogs.character")
         await bot.load_extension("cogs.inventory")
-        await bot.start(Bot Token)
-        
+        await bot.load_extension("cogs.camp")
+        try:
+            await bot.start(Bot Token)
+        finally:
+            await bot.repo.close()
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
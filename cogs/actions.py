@@ -5,15 +5,13 @@ from discord import app_commands
 from discord.ext import commands
 import json
 import os
-import random
 
 from utils.constants import SKILLS
 from utils.actions import ACTIONS
 from utils.action_handler import ACTION_HANDLERS
-from utils.items import ITEMS, roll_loot, format_loot, ABSTRACT_RESOURCES
-from utils.base import load_base, save_base
-from utils.io import load_characters, save_characters
-from utils.rolls import BASE_DICE, roll_dice_pool, calculate_successes, reroll_lowest, format_roll_embed
+from utils.items import roll_loot, format_loot, ABSTRACT_RESOURCES
+from utils.rolls import BASE_DICE, DicePool, format_roll_embed
+from utils.sessions import ROLL_TTL, SessionStore, show_expired
 
 DATA_PATH = "data/characters.json"
 
@@ -21,11 +19,60 @@ REACTION_ADD = "➕"   # ➕ Add Die
 REACTION_REROLL = "🔁"  # 🔁 Reroll Lowest
 REACTION_SUBMIT = "✅"  # ✅ Submit
 
+# Roll controls, chosen with BATHALA_INTERACTION_MODE (see bot.py).
+#
+# Discord API calls for a solo action with n Add/Reroll clicks:
+#   reactions: send + original_response + 3 add_reaction, then per click one
+#              remove_reaction and at most one (debounced) edit, then one
+#              result message -> 5 + 2n + 1 calls in the worst case
+#   buttons:   send, then each click is answered by the interaction response
+#              itself (edit_message), including the final result -> 1 + n + 1
+INTERACTION_REACTIONS = "reactions"
+INTERACTION_BUTTONS = "buttons"
+
+
+class RollView(discord.ui.View):
+    """Button controls for a solo roll. Each click is answered by editing the roll message."""
+
+    def __init__(self, cog, data):
+        super().__init__(timeout=None)
+        self.cog = cog
+        self.data = data
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if str(interaction.user.id) != self.data["user_id"]:
+            await interaction.response.send_message("This isn't your roll.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Add Die", emoji=REACTION_ADD, style=discord.ButtonStyle.primary)
+    async def add_die(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cog.handle_roll_button(interaction, self, REACTION_ADD)
+
+    @discord.ui.button(label="Reroll Lowest", emoji=REACTION_REROLL, style=discord.ButtonStyle.secondary)
+    async def reroll(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cog.handle_roll_button(interaction, self, REACTION_REROLL)
+
+    @discord.ui.button(label="Submit", emoji=REACTION_SUBMIT, style=discord.ButtonStyle.success)
+    async def submit(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cog.handle_roll_button(interaction, self, REACTION_SUBMIT)
+
+
 class Actions(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.daily_actions = {}  # Track users who already acted
-        self.active_rolls = {}  # Track ongoing rolls
+        self.active_rolls = SessionStore("rolls", ROLL_TTL, self.expire_roll)  # Track ongoing rolls
+
+    async def cog_load(self):
+        self.active_rolls.start()
+
+    async def cog_unload(self):
+        self.active_rolls.stop()
+
+    async def expire_roll(self, key, data):
+        self.bot.reactions.unregister(key)
+        self.bot.renderer.cancel(key)
+        await show_expired(data, ACTIONS[data["action"]]["name"])
 
     @app_commands.command(name="do_action", description="Perform a daily action to help the camp")
     @app_commands.describe(action="The action you want to take")
@@ -33,36 +80,44 @@ class Actions(commands.Cog):
         print("/do_action command received")
         user_id = str(interaction.user.id)
 
-        if self.daily_actions.get(user_id):
-            await interaction.response.send_message("You already did an action today.", ephemeral=True)
+        repo = self.bot.repo
+        if user_id not in repo:
+            await interaction.response.send_message("You need to create a character first.", ephemeral=True)
             return
 
-        characters = load_characters()
-        print("Loaded characters")
-        if user_id not in characters:
-            await interaction.response.send_message("You need to create a character first.", ephemeral=True)
+        if repo.ledger.has_acted(user_id):
+            await interaction.response.send_message("You already did an action today.", ephemeral=True)
             return
 
         if action not in ACTIONS:
             await interaction.response.send_message("Invalid action.", ephemeral=True)
             return
 
-        char = characters[user_id]
         skill_name = ACTIONS[action]["skill"]
-        skill_value = char["skills"].get(skill_name, 0)
-        inventory = char.get("inventory", [])
+        skill_value = repo.skills.base(user_id, skill_name)
+        total_skill = repo.skills.effective(user_id, skill_name)
+        tool_bonus = total_skill - skill_value
+        print(f"Skill value: {skill_value}, Tool bonus: {tool_bonus}, Total skill: {total_skill}")
 
-        equipped = [i[2:] for i in inventory if i.startswith("E:")]
-        tool_bonus = sum(
-            ITEMS[i].get("bonus", {}).get(skill_name, 0)
-            for i in equipped if i in ITEMS
-        )
+        pool = DicePool.roll(BASE_DICE)
+        embed = format_roll_embed(interaction.user, ACTIONS[action], pool, skill_name, total_skill)
 
-        total_skill = skill_value + tool_bonus
-        print(f"Skill value: {skill_value}, Tool bonus: {tool_bonus}, Total skill: {total_skill}")
+        data = {
+            "user_id": user_id,
+            "action": action,
+            "pool": pool,
+            "skill": skill_name,
+            "skill_points": total_skill,
+            "interaction": interaction,
+        }
 
-        rolls = roll_dice_pool(BASE_DICE)
-        embed = format_roll_embed(interaction.user, ACTIONS[action], rolls, skill_name, total_skill, [rolls.copy()])
+        if self.bot.interaction_mode == INTERACTION_BUTTONS:
+            data["view"] = RollView(self, data)
+            data["key"] = interaction.id
+            await interaction.response.send_message(embed=embed, view=data["view"], ephemeral=False)
+            self.active_rolls.add(data["key"], data)
+            print("Sent initial roll message with buttons")
+            return
 
         try:
             await interaction.response.send_message(embed=embed, ephemeral=False)
@@ -76,79 +131,110 @@ class Actions(commands.Cog):
             print(f"Error sending message or adding reactions: {e}")
             return
 
-        self.active_rolls[message.id] = {
-            "user_id": user_id,
-            "action": action,
-            "rolls": rolls,
-            "skill": skill_name,
-            "skill_points": total_skill,
-            "message": message,
-            "interaction": interaction,
-            "history": [rolls.copy()]
-        }
+        data["message"] = message
+        self.active_rolls.add(message.id, data)
+        self.bot.reactions.register(message.id, self.handle_roll_reaction)
 
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        if user.bot or reaction.message.id not in self.active_rolls:
-            return
-
-        data = self.active_rolls[reaction.message.id]
-        if str(user.id) != data["user_id"]:
-            return
-
-        rolls = data["rolls"]
+    def apply_roll_change(self, data, emoji):
+        """Spend skill points on ➕ or 🔁. Returns True if the pool changed."""
+        pool = data["pool"]
         skill_points = data["skill_points"]
 
-        print("Reaction valid")
-        updated = False
-
-        if reaction.emoji == REACTION_ADD and skill_points >= 3:
-            rolls.append(random.randint(1, 6))
+        if emoji == REACTION_ADD and skill_points >= 3:
+            pool.add_die()
             data["skill_points"] -= 3
             print("Added die")
-            updated = True
+            return True
 
-        elif reaction.emoji == REACTION_REROLL and skill_points >= 1:
-            rolls, history = reroll_lowest(rolls, data["history"])
+        if emoji == REACTION_REROLL and skill_points >= 1:
+            pool.reroll_lowest()
             data["skill_points"] -= 1
-            data["rolls"] = rolls
-            data["history"] = history
             print("Rerolled lowest")
-            updated = True
-
-        elif reaction.emoji == REACTION_SUBMIT:
-            successes = calculate_successes(rolls)
-            handler = ACTION_HANDLERS.get(data["action"])
-            extra_message = ""
+            return True
+
+        return False
+
+    async def submit_roll(self, data, user):
+        """Run the action's handler and mark the daily action. Returns the result embed."""
+        pool = data["pool"]
+        successes = pool.successes
+        handler = ACTION_HANDLERS.get(data["action"])
+        extra_message = ""
+        async with self.bot.repo.transaction(data["user_id"]) as repo:
+            # Checked again here: another roll or group action may have used
+            # the day's action since this roll started
+            if repo.ledger.has_acted(data["user_id"]):
+                print("Refused submit: already acted today")
+                return discord.Embed(
+                    title=f"❌ Not Submitted: {ACTIONS[data['action']]['name']}",
+                    description=f"{user.display_name} already did an action today.",
+                    color=discord.Color.red()
+                )
             if handler:
-                result_text = handler(data["user_id"], successes)
+                result_text = handler(repo, data["user_id"], successes)
                 extra_message = f"\n\n📦 Result:\n{result_text}"
+            repo.ledger.record(data["user_id"])
 
-            result_embed = discord.Embed(
-                title=f"✅ Final Result: {ACTIONS[data['action']]['name']}",
-                description=f"{user.display_name} achieved **{successes} successes** with rolls: {', '.join(map(str, rolls))}{extra_message}",
-                color=discord.Color.green()
-            )
-            await reaction.message.channel.send(embed=result_embed)
+        print("Submitted result")
+        return discord.Embed(
+            title=f"✅ Final Result: {ACTIONS[data['action']]['name']}",
+            description=f"{user.display_name} achieved **{successes} successes** with rolls: {', '.join(map(str, pool))}{extra_message}",
+            color=discord.Color.green()
+        )
+
+    async def handle_roll_button(self, interaction, view, emoji):
+        data = view.data
+        if data["key"] not in self.active_rolls:
+            await interaction.response.send_message("This roll has already ended.", ephemeral=True)
+            return
+        data["interaction"] = interaction  # Expiry edits through the freshest token
+        self.active_rolls.touch(data["key"])
+
+        if emoji == REACTION_SUBMIT:
+            self.active_rolls.pop(data["key"])
+            view.stop()
+            result_embed = await self.submit_roll(data, interaction.user)
+            await interaction.response.edit_message(embed=result_embed, view=None)
+            return
+
+        if not self.apply_roll_change(data, emoji):
+            await interaction.response.send_message("Not enough skill points for that.", ephemeral=True)
+            return
+
+        embed = format_roll_embed(interaction.user, ACTIONS[data["action"]], data["pool"], data["skill"], data["skill_points"])
+        await interaction.response.edit_message(embed=embed, view=view)
+
+    async def handle_roll_reaction(self, payload, emoji, user):
+        data = self.active_rolls.get(payload.message_id)
+        if data is None or str(user.id) != data["user_id"]:
+            return
 
-            self.daily_actions[data["user_id"]] = True
-            del self.active_rolls[reaction.message.id]
-            print("Submitted result")
+        print("Reaction valid")
+        message = data["message"]
+
+        if emoji == REACTION_SUBMIT:
+            self.active_rolls.pop(payload.message_id)
+            self.bot.reactions.unregister(payload.message_id)
+            await self.bot.renderer.finish(payload.message_id)
+            result_embed = await self.submit_roll(data, user)
+            await message.channel.send(embed=result_embed)
             return
 
-        if updated:
+        if self.apply_roll_change(data, emoji):
+            self.active_rolls.touch(payload.message_id)
             action_data = ACTIONS[data["action"]]
-            new_embed = format_roll_embed(user, action_data, rolls, data["skill"], data["skill_points"], data["history"])
+            pool = data["pool"]
+            # Edits are debounced per message and always render the latest state
+            self.bot.renderer.request(
+                message,
+                lambda: format_roll_embed(user, action_data, pool, data["skill"], data["skill_points"])
+            )
 
-            # 🔧 Fetch the latest version of the message
             try:
-                channel = reaction.message.channel
-                updated_message = await channel.fetch_message(reaction.message.id)
-                await updated_message.edit(embed=new_embed)
-                await updated_message.remove_reaction(reaction.emoji, user)
-                print("✅ Updated embed and removed reaction")
+                await message.remove_reaction(emoji, user)
+                print("✅ Queued embed update and removed reaction")
             except Exception as e:
-                print(f"❌ Failed to update embed: {e}")
+                print(f"❌ Failed to remove reaction: {e}")
 
     @app_commands.command(name="list_actions", description="List available actions")
     async def list_actions(self, interaction: discord.Interaction):
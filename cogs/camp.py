@@ -0,0 +1,71 @@
+# cogs/camp.py
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.camp import HUNGER_BUCKETS, RESOURCE_IDS, THIRST_BUCKETS
+from utils.items import ABSTRACT_RESOURCES
+
+
+class Camp(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="camp_report", description="(Admin) Camp-wide totals: supplies, hunger, skills and gear.")
+    @app_commands.describe(verify="Also rescan every character to check the live totals")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def camp_report(self, interaction: discord.Interaction, verify: bool = False):
+        repo = self.bot.repo
+        totals = repo.camp.totals()
+
+        embed = discord.Embed(
+            title="🏕️ Camp Report",
+            description=f"🧍 **{totals['survivors']}** survivor(s)",
+            color=discord.Color.dark_teal()
+        )
+
+        # Supplies carried by survivors, plus what's in the base stash
+        base_summary = repo.base["inventory"].track()
+        resource_lines = []
+        for item_id, (key, units) in zip(RESOURCE_IDS, totals["resources"].items()):
+            in_base = base_summary.items.get(item_id, 0)
+            resource_lines.append(f"{ABSTRACT_RESOURCES[key]}: **{units}** carried, **{in_base}** in base")
+        embed.add_field(name="📊 Resources", value="\n".join(resource_lines), inline=False)
+
+        embed.add_field(
+            name="🍗 Hunger",
+            value="\n".join(f"{bucket.title()}: {totals['hunger'][bucket]}" for bucket in HUNGER_BUCKETS),
+            inline=True
+        )
+        embed.add_field(
+            name="💧 Thirst",
+            value="\n".join(f"{bucket.title()}: {totals['thirst'][bucket]}" for bucket in THIRST_BUCKETS),
+            inline=True
+        )
+
+        skill_lines = []
+        for skill, histogram in totals["skills"].items():
+            levels = " ".join(f"`{level}`×{count}" for level, count in histogram.items())
+            skill_lines.append(f"• {skill}: {levels or '-'}")
+        embed.add_field(name="📈 Skills (level × survivors)", value="\n".join(skill_lines), inline=False)
+
+        gear = sorted(totals["equipped"].items(), key=lambda entry: -entry[1])
+        gear_lines = [f"• {name} x{units}" for name, units in gear[:15]]
+        if len(gear) > 15:
+            gear_lines.append(f"… and {len(gear) - 15} more")
+        embed.add_field(name="🛠️ Equipped Gear", value="\n".join(gear_lines) or "None", inline=False)
+
+        if verify:
+            problems = repo.camp.verify()
+            if problems:
+                print(f"❌ Camp index mismatch: {problems}")
+                embed.add_field(name="❌ Consistency", value="\n".join(problems)[:1024], inline=False)
+            else:
+                embed.add_field(name="✅ Consistency", value="Live totals match a full rescan.", inline=False)
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Camp(bot))
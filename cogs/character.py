@@ -12,8 +12,8 @@ from utils.constants import get_default_character, SKILLS, STARTING_SKILL_POINTS
 
 DATA_PATH = "data/characters.json"
 
-from utils.io import load_characters, save_characters
 from utils.hunger_thirst import update_hunger_thirst, get_hunger_thirst_percent
+from utils.inventory import Stash
 
 class Character(commands.Cog):
     def __init__(self, bot):
@@ -28,38 +28,42 @@ class Character(commands.Cog):
             user_id = str(interaction.user.id)
             print(f"User ID: {user_id}")
 
-            characters = load_characters()
-            print("Characters loaded.")
+            repo = self.bot.repo
 
-            if user_id in characters:
-                await interaction.response.send_message("You already have a character.", ephemeral=True)
-                print("❗ Character already exists.")
-                return
+            async with repo.transaction(user_id):
+                if user_id in repo:
+                    await interaction.response.send_message("You already have a character.", ephemeral=True)
+                    print("❗ Character already exists.")
+                    return
 
-            if background not in BACKGROUNDS:
-                await interaction.response.send_message("Invalid background. Use `/backgrounds` to see available options.", ephemeral=True)
-                print(f"❗ Invalid background: {background}")
-                return
+                if background not in BACKGROUNDS:
+                    await interaction.response.send_message("Invalid background. Use `/backgrounds` to see available options.", ephemeral=True)
+                    print(f"❗ Invalid background: {background}")
+                    return
 
-            new_character = get_default_character()
-            print("Default character copied.")
+                new_character = get_default_character()
+                print("Default character copied.")
 
-            new_character["name"] = name
-            new_character["background"] = background
-            new_character["skills"] = get_default_character()["skills"].copy()
+                new_character["name"] = name
+                new_character["background"] = background
+                new_character["skills"] = get_default_character()["skills"].copy()
             
-            # Give Skill Bonus
-            bonuses = BACKGROUNDS[background]["skills"]
-            for skill, bonus in bonuses.items():
-                if skill in new_character["skills"]:
-                    new_character["skills"][skill] += bonus
+                # Give Skill Bonus
+                bonuses = BACKGROUNDS[background]["skills"]
+                for skill, bonus in bonuses.items():
+                    if skill in new_character["skills"]:
+                        new_character["skills"][skill] += bonus
                     
-            # Give starting equipment
-            char_equipment = BACKGROUNDS[background].get("equipment", [])
-            new_character["inventory"] = char_equipment.copy()
+                # Give starting equipment
+                char_equipment = BACKGROUNDS[background].get("equipment", [])
+                new_character["inventory"] = Stash.from_data(char_equipment)
 
-            characters[user_id] = new_character
-            save_characters(characters)
+                repo.add(user_id, new_character)
+
+                # Start predicting this character's hunger/thirst alerts
+                hunger = self.bot.get_cog("HungerThirst")
+                if hunger is not None:
+                    hunger.alerts.schedule(user_id)
             print("Character saved.")
 
             await interaction.response.send_message(
@@ -88,46 +92,48 @@ class Character(commands.Cog):
                               medical: int = 0,
                               stealth: int = 0):
         user_id = str(interaction.user.id)
-        characters = load_characters()
-
-        if user_id not in characters:
-            await interaction.response.send_message("You don't have a character. Use `/create_character`.", ephemeral=True)
-            return
-
-        char = characters[user_id]
-
-        if char.get("allocated"):
-            await interaction.response.send_message("You've already allocated your skill points.", ephemeral=True)
-            return
-
-        inputs = {
-            "Scavenging": scavenging,
-            "Crafting": crafting,
-            "Farming": farming,
-            "Cooking": cooking,
-            "Melee": melee,
-            "Ranged": ranged,
-            "Medical": medical,
-            "Stealth": stealth,
-        }
-
-        total = sum(inputs.values())
-        if total > char["unallocated_points"]:
-            await interaction.response.send_message(f"You have {char['unallocated_points']} points. You tried to spend {total}.", ephemeral=True)
-            return
-
-        # Soft cap enforcement
-        for skill, value in inputs.items():
-            if value > 3:
-                await interaction.response.send_message(f"You cannot assign more than 3 points to {skill} at creation.", ephemeral=True)
+        repo = self.bot.repo
+
+        async with repo.transaction(user_id):
+            if user_id not in repo:
+                await interaction.response.send_message("You don't have a character. Use `/create_character`.", ephemeral=True)
+                return
+
+            char = repo.get(user_id)
+
+            if char.get("allocated"):
+                await interaction.response.send_message("You've already allocated your skill points.", ephemeral=True)
                 return
 
-        for skill, value in inputs.items():
-            char["skills"][skill] += value
+            inputs = {
+                "Scavenging": scavenging,
+                "Crafting": crafting,
+                "Farming": farming,
+                "Cooking": cooking,
+                "Melee": melee,
+                "Ranged": ranged,
+                "Medical": medical,
+                "Stealth": stealth,
+            }
+
+            total = sum(inputs.values())
+            if total > char["unallocated_points"]:
+                await interaction.response.send_message(f"You have {char['unallocated_points']} points. You tried to spend {total}.", ephemeral=True)
+                return
+
+            # Soft cap enforcement
+            for skill, value in inputs.items():
+                if value > 3:
+                    await interaction.response.send_message(f"You cannot assign more than 3 points to {skill} at creation.", ephemeral=True)
+                    return
 
-        char["unallocated_points"] -= total
-        char["allocated"] = True
-        save_characters(characters)
+            for skill, value in inputs.items():
+                char["skills"][skill] += value
+
+            char["unallocated_points"] -= total
+            char["allocated"] = True
+            repo.skills.invalidate(user_id)
+            repo.mark_dirty(user_id)
 
         await interaction.response.send_message("✅ Skills allocated successfully!", ephemeral=True)
     
@@ -165,14 +171,15 @@ class Character(commands.Cog):
     async def set_character_image(self, interaction: discord.Interaction, image_url: str):
         try:
             user_id = str(interaction.user.id)
-            characters = load_characters()
+            repo = self.bot.repo
 
-            if user_id not in characters:
-                await interaction.response.send_message("You don't have a character yet. Use `/create_character` first.", ephemeral=True)
-                return
+            async with repo.transaction(user_id):
+                if user_id not in repo:
+                    await interaction.response.send_message("You don't have a character yet. Use `/create_character` first.", ephemeral=True)
+                    return
 
-            characters[user_id]["image"] = image_url
-            save_characters(characters)
+                repo.get(user_id)["image"] = image_url
+                repo.mark_dirty(user_id)
 
             await interaction.response.send_message("🖼️ Character image set successfully!", ephemeral=True)
 
@@ -190,17 +197,18 @@ class Character(commands.Cog):
         try:
             print(f"🟢 /check triggered by {interaction.user}")
             user_id = str(interaction.user.id)
-            characters = load_characters()
+            repo = self.bot.repo
 
-            if user_id not in characters:
-                await interaction.response.send_message("You don't have a character yet. Use `/create_character` to begin.", ephemeral=True)
-                return
+            async with repo.transaction(user_id):
+                if user_id not in repo:
+                    await interaction.response.send_message("You don't have a character yet. Use `/create_character` to begin.", ephemeral=True)
+                    return
 
-            char = characters[user_id]
+                char = repo.get(user_id)
 
-            # ⏱️ Update hunger/thirst on every check
-            update_hunger_thirst(char)
-            save_characters(characters)
+                # ⏱️ Update hunger/thirst on every check
+                update_hunger_thirst(char)
+                repo.mark_dirty(user_id)
 
             # Extract data
             name = char["name"]
@@ -208,8 +216,7 @@ class Character(commands.Cog):
             hp = char["hp"]
             injury = char.get("injury", "None")
             skills = char.get("skills", {})
-            inventory = char.get("inventory", [])
-            equipped = [item for item in inventory if item.startswith("E:")]
+            inventory = char["inventory"]
 
             hunger_thirst = get_hunger_thirst_percent(char)
             hunger_percent = hunger_thirst["hunger_percent"]
@@ -228,23 +235,18 @@ class Character(commands.Cog):
             skill_list = "\n".join([f"• {skill}: {level}" for skill, level in skills.items()])
             embed.add_field(name="📈 Skills", value=skill_list or "No skills yet", inline=False)
 
-            from collections import Counter
-
+            equipped = inventory.equipped_items()
             if equipped:
-                equipped_names = [item[2:] for item in equipped]
-                equipped_counts = Counter(equipped_names)
                 equip_list = "\n".join(
                     f"• {name} x{count}" if count > 1 else f"• {name}"
-                    for name, count in equipped_counts.items()
+                    for name, count in equipped
                 )
                 embed.add_field(name="🛠️ Equipped", value=equip_list, inline=False)
 
             if inventory:
-                visible_inventory = [item for item in inventory if not item.startswith("E:")]
-                inv_counts = Counter(visible_inventory)
                 item_list = "\n".join(
                     f"• {name} x{count}" if count > 1 else f"• {name}"
-                    for name, count in inv_counts.items()
+                    for name, count in inventory.carried_items()
                 )
                 embed.add_field(name="🎒 Inventory", value=item_list or "Empty", inline=False)
 
@@ -264,17 +266,16 @@ class Character(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def kill(self, interaction: discord.Interaction, user: discord.User):
         user_id = str(user.id)
-        characters = load_characters()
-        char = characters[user_id]
+        repo = self.bot.repo
 
-        if user_id not in characters:
-            await interaction.response.send_message(f"{user.display_name} has no character.", ephemeral=True)
-            return
+        async with repo.transaction(user_id):
+            if user_id not in repo:
+                await interaction.response.send_message(f"{user.display_name} has no character.", ephemeral=True)
+                return
 
-        name = char["name"]
+            name = repo.get(user_id)["name"]
         
-        del characters[user_id]
-        save_characters(characters)
+            repo.remove(user_id)
 
         await interaction.response.send_message(f"☠️ **{name}** has been killed and removed.")
 
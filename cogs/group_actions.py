@@ -4,25 +4,138 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-import random
 
-from utils.io import load_characters, save_characters
-from utils.items import ITEMS
 from utils.actions import ACTIONS
-from utils.action_handler import ACTION_HANDLERS
-from utils.base import load_base, save_base
+from utils.action_handler import GROUP_ACTION_HANDLERS
 from utils.items import roll_loot, format_loot
-from utils.rolls import BASE_DICE, roll_dice_pool, calculate_successes, reroll_lowest, format_grouproll_embed
+from utils.members import MemberResolver
+from utils.rolls import BASE_DICE, DicePool, format_grouproll_embed
+from utils.sessions import LOBBY_TTL, ROLL_TTL, SessionStore, show_expired
 
 REACTION_ADD = "➕"   # ➕ Add Die
 REACTION_REROLL = "🔁"  # 🔁 Reroll Lowest
 REACTION_SUBMIT = "✅"  # ✅ Submit
+REACTION_JOIN = "✅"
+REACTION_LAUNCH = "🚀"
+
+INTERACTION_BUTTONS = "buttons"
+
+
+class LobbyView(discord.ui.View):
+    """Join/Launch buttons for a group lobby. Launch turns the lobby message into the roll."""
+
+    def __init__(self, cog, session):
+        super().__init__(timeout=None)
+        self.cog = cog
+        self.session = session
+
+    @discord.ui.button(label="Join", emoji=REACTION_JOIN, style=discord.ButtonStyle.primary)
+    async def join(self, interaction: discord.Interaction, button: discord.ui.Button):
+        session = self.session
+        if session["key"] not in self.cog.group_sessions:
+            await interaction.response.send_message("This lobby has already closed.", ephemeral=True)
+            return
+        session["interaction"] = interaction
+        self.cog.group_sessions.touch(session["key"])
+        if interaction.user.id in session["members"]:
+            await interaction.response.send_message("You already joined.", ephemeral=True)
+            return
+        if self.cog.bot.repo.ledger.has_acted(str(interaction.user.id)):
+            await interaction.response.send_message("You already did an action today.", ephemeral=True)
+            return
+        session["members"].add(interaction.user.id)
+        session["users"][interaction.user.id] = interaction.user
+        await interaction.response.edit_message(embed=self.cog.format_lobby_embed(session), view=self)
+
+    @discord.ui.button(label="Launch", emoji=REACTION_LAUNCH, style=discord.ButtonStyle.success)
+    async def launch(self, interaction: discord.Interaction, button: discord.ui.Button):
+        session = self.session
+        if interaction.user.id != session["leader"]:
+            await interaction.response.send_message("Only the leader can launch the action.", ephemeral=True)
+            return
+        if self.cog.group_sessions.pop(session["key"]) is None:
+            await interaction.response.send_message("This lobby has already closed.", ephemeral=True)
+            return
+        self.stop()
+        data = await self.cog.prepare_group_roll(session)
+        data["key"] = session["key"]
+        data["interaction"] = interaction
+        data["view"] = GroupRollView(self.cog, data)
+        self.cog.active_group_rolls.add(data["key"], data)
+        embed = format_grouproll_embed(ACTIONS[data["action"]], data["pool"], data["members"], data["submitted"])
+        await interaction.response.edit_message(embed=embed, view=data["view"])
+        if data["skipped"]:
+            await interaction.followup.send(
+                "\n".join(f"❌ <@{user_id}> {reason}." for user_id, reason in data["skipped"].items())
+            )
+
+
+class GroupRollView(discord.ui.View):
+    """Add Die / Reroll Lowest / Submit buttons on the shared group roll."""
+
+    def __init__(self, cog, data):
+        super().__init__(timeout=None)
+        self.cog = cog
+        self.data = data
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id not in self.data["members"]:
+            await interaction.response.send_message("You're not part of this group action.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Add Die", emoji=REACTION_ADD, style=discord.ButtonStyle.primary)
+    async def add_die(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cog.handle_group_button(interaction, self, REACTION_ADD)
+
+    @discord.ui.button(label="Reroll Lowest", emoji=REACTION_REROLL, style=discord.ButtonStyle.secondary)
+    async def reroll(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cog.handle_group_button(interaction, self, REACTION_REROLL)
+
+    @discord.ui.button(label="Submit", emoji=REACTION_SUBMIT, style=discord.ButtonStyle.success)
+    async def submit(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cog.handle_group_button(interaction, self, REACTION_SUBMIT)
+
 
 class GroupActions(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.group_sessions = {}  # {message_id: {"leader": user_id, "action": str, "members": set(user_id)}}
-        self.active_group_rolls = {}
+        self.members = MemberResolver(bot)  # Shared user cache across launches
+        # {message_id: {"leader": user_id, "action": str, "members": set(user_id)}}
+        self.group_sessions = SessionStore("lobbies", LOBBY_TTL, self.expire_session)
+        self.active_group_rolls = SessionStore("group rolls", ROLL_TTL, self.expire_session)
+
+    async def cog_load(self):
+        self.group_sessions.start()
+        self.active_group_rolls.start()
+
+    async def cog_unload(self):
+        self.group_sessions.stop()
+        self.active_group_rolls.stop()
+
+    async def expire_session(self, key, data):
+        self.bot.reactions.unregister(key)
+        self.bot.renderer.cancel(key)
+        await show_expired(data, f"Group Action: {ACTIONS[data['action']]['name']}")
+
+    def format_lobby_embed(self, session):
+        action_data = ACTIONS[session["action"]]
+        if self.bot.interaction_mode == INTERACTION_BUTTONS:
+            instructions = "Press **Join** to join. The leader presses **Launch** to start."
+        else:
+            instructions = "React with ✅ to join. Leader reacts with 🚀 to start."
+
+        embed = discord.Embed(
+            title=f"👥 Group Action: {action_data['name']}",
+            description=instructions,
+            color=discord.Color.purple()
+        )
+        embed.add_field(name="Description", value=action_data['description'], inline=False)
+        if session["users"]:
+            names = "\n".join(user.display_name for user in session["users"].values())
+            embed.add_field(name="Members", value=names, inline=False)
+        embed.set_footer(text="Only the leader can launch the action.")
+        return embed
 
     @app_commands.command(name="group_action", description="Start a group action that others can join")
     @app_commands.describe(action="The group action you want to perform")
@@ -31,144 +144,238 @@ class GroupActions(commands.Cog):
             await interaction.response.send_message("Invalid action.", ephemeral=True)
             return
 
-        user_id = str(interaction.user.id)
-
-        embed = discord.Embed(
-            title=f"👥 Group Action: {ACTIONS[action]['name']}",
-            description="React with ✅ to join. Leader reacts with 🚀 to start.",
-            color=discord.Color.purple()
-        )
-        embed.add_field(name="Description", value=ACTIONS[action]['description'], inline=False)
-        embed.set_footer(text="Only the leader can launch the action.")
-
-        await interaction.response.send_message(embed=embed)
-        message = await interaction.original_response()
-        await message.add_reaction("✅")
-        await message.add_reaction("🚀")
+        if self.bot.repo.ledger.has_acted(str(interaction.user.id)):
+            await interaction.response.send_message("You already did an action today.", ephemeral=True)
+            return
 
-        # Register session for async reaction handler
-        self.group_sessions[message.id] = {
+        session = {
             "leader": interaction.user.id,
             "action": action,
             "members": {interaction.user.id},  # Leader auto-joins
-            "message": message
+            "users": {interaction.user.id: interaction.user},
         }
+        embed = self.format_lobby_embed(session)
+
+        if self.bot.interaction_mode == INTERACTION_BUTTONS:
+            session["key"] = interaction.id
+            session["interaction"] = interaction
+            session["view"] = LobbyView(self, session)
+            await interaction.response.send_message(embed=embed, view=session["view"])
+            self.group_sessions.add(session["key"], session)
+            print("[GROUP] Created group action lobby with buttons")
+            return
+
+        await interaction.response.send_message(embed=embed)
+        message = await interaction.original_response()
+        await message.add_reaction(REACTION_JOIN)
+        await message.add_reaction(REACTION_LAUNCH)
+
+        # Register session with the reaction router
+        session["message"] = message
+        self.group_sessions.add(message.id, session)
+        self.bot.reactions.register(message.id, self.handle_lobby_reaction)
 
         print(f"[GROUP] Created group action session for message {message.id}")
 
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        if user.bot:
-            return
+    def apply_group_change(self, data, user_id, emoji):
+        """Spend a member's skill points on ➕ or 🔁. Returns True if the pool changed."""
+        member_data = data["members"][user_id]
+        pool = data["pool"]
+
+        if emoji == REACTION_ADD and member_data["skill_points"] >= 3:
+            pool.add_die()
+            member_data["skill_points"] -= 3
+            return True
+
+        if emoji == REACTION_REROLL and member_data["skill_points"] >= 1:
+            pool.reroll_lowest()
+            member_data["skill_points"] -= 1
+            return True
+
+        return False
+
+    async def settle_group(self, data):
+        """
+        Apply the group's rewards and use up every member's daily action.
+
+        Loot is rolled once for the pooled successes and split by the bot's
+        group_loot_rule. All changes happen in one transaction and are
+        persisted by a single flush. Members who used their daily action
+        elsewhere since the lobby launched get no share. Returns the result embed.
+        """
+        repo = self.bot.repo
+        handler = GROUP_ACTION_HANDLERS.get(data["action"])
+        result_text = None
+        already_acted = []
+
+        async with repo.transaction(*(str(user_id) for user_id in data["members"]), "base"):
+            member_ids = []
+            for user_id in data["members"]:
+                if repo.ledger.has_acted(str(user_id)):
+                    print(f"[GROUP] {user_id} already acted today, dropped from the split")
+                    already_acted.append(user_id)
+                else:
+                    member_ids.append(str(user_id))
+
+            if handler and member_ids:
+                result_text = handler(repo, member_ids, data["pool"].successes, self.bot.group_loot_rule)
+            for user_id in member_ids:
+                repo.ledger.record(user_id)
+
+        try:
+            await repo.request_flush()
+        except Exception as e:
+            print(f"❌ Failed to persist group result: {e}")
+        return self.format_group_result(data, result_text, already_acted)
+
+    def format_group_result(self, data, result_text=None, already_acted=()):
+        pool = data["pool"]
+        action_data = ACTIONS[data["action"]]
+        extra_message = f"\n\n📦 Result:\n{result_text}" if result_text else ""
+        if already_acted:
+            names = ", ".join(data["members"][user_id]["user"].display_name for user_id in already_acted)
+            extra_message += f"\n\n⚠️ No share for {names}: already did an action today."
+        return discord.Embed(
+            title=f"🎯 Final Group Result: {action_data['name']}",
+            description=f"🎲 Rolls: {', '.join(map(str, pool))}\n⭐ Total Successes: **{pool.successes}**{extra_message}",
+            color=discord.Color.green()
+        )
 
-        message_id = reaction.message.id
-
-        # --- Handle Group Lobby Join/Launch ---
-        if message_id in self.group_sessions:
-            session = self.group_sessions[message_id]
-            action_key = session["action"]
-            print(f"[GROUP-LOBBY] Reaction from {user.display_name}: {reaction.emoji}")
-
-            if reaction.emoji == "✅":
-                if user.id not in session["members"]:
-                    session["members"].add(user.id)
-                    await reaction.message.channel.send(f"✅ {user.display_name} joined the group action!", delete_after=5)
-
-            elif reaction.emoji == "🚀" and user.id == session["leader"]:
-                await self.launch_group_action(session)
-                del self.group_sessions[message_id]
-
-            await reaction.remove(user)
-            return  # ✅ Done handling lobby
-
-        # --- Handle Group Action Roll Phase ---
-        if message_id in self.active_group_rolls:
-            data = self.active_group_rolls[message_id]
-            user_id = user.id
-
-            if user_id not in data["members"]:
-                return  # Not a participant
-
-            member_data = data["members"][user_id]
-            rolls = data["rolls"]
-            history = data["history"]
-            submitted = data["submitted"]
-
-            updated = False
-            print(f"[GROUP-ROLL] {user.display_name} reacted: {reaction.emoji}")
-
-            if reaction.emoji == REACTION_ADD and member_data["skill_points"] >= 3:
-                rolls.append(random.randint(1, 6))
-                member_data["skill_points"] -= 3
-                updated = True
-
-            elif reaction.emoji == REACTION_REROLL and member_data["skill_points"] >= 1:
-                rolls, history = reroll_lowest(rolls, history)
-                member_data["skill_points"] -= 1
-                data["rolls"] = rolls
-                data["history"] = history
-                updated = True
-
-            elif reaction.emoji == REACTION_SUBMIT:
-                submitted.add(user_id)
-                await reaction.message.channel.send(f"✅ {user.display_name} is ready!", delete_after=5)
-
-                if submitted == set(data["members"].keys()):
-                    # All users submitted!
-                    total_successes = calculate_successes(data["rolls"])
-                    action_data = ACTIONS[data["action"]]
-                    result_embed = discord.Embed(
-                        title=f"🎯 Final Group Result: {action_data['name']}",
-                        description=f"🎲 Rolls: {', '.join(map(str, data['rolls']))}\n⭐ Total Successes: **{total_successes}**",
-                        color=discord.Color.green()
-                    )
-                    await reaction.message.channel.send(embed=result_embed)
-                    del self.active_group_rolls[message_id]
+    async def handle_group_button(self, interaction, view, emoji):
+        data = view.data
+        user_id = interaction.user.id
+        if data["key"] not in self.active_group_rolls:
+            await interaction.response.send_message("This group action has already ended.", ephemeral=True)
+            return
+        data["interaction"] = interaction
+        self.active_group_rolls.touch(data["key"])
+
+        if emoji == REACTION_SUBMIT:
+            data["submitted"].add(user_id)
+            if data["submitted"] == set(data["members"].keys()):
+                # All users submitted!
+                if self.active_group_rolls.pop(data["key"]) is None:
+                    await interaction.response.send_message("This group action has already ended.", ephemeral=True)
                     return
+                view.stop()
+                await interaction.response.edit_message(embed=await self.settle_group(data), view=None)
+                return
+        elif not self.apply_group_change(data, user_id, emoji):
+            await interaction.response.send_message("Not enough skill points for that.", ephemeral=True)
+            return
 
-            if updated:
-                embed = format_grouproll_embed(
-                    ACTIONS[data["action"]],
-                    rolls,
-                    data["members"],
-                    history,
-                    submitted
-                )
-                try:
-                    channel = reaction.message.channel
-                    updated_msg = await channel.fetch_message(message_id)
-                    await updated_msg.edit(embed=embed)
-                    await updated_msg.remove_reaction(reaction.emoji, user)
-                except Exception as e:
-                    print(f"[ERROR] Failed to update group roll embed: {e}")
+        embed = format_grouproll_embed(ACTIONS[data["action"]], data["pool"], data["members"], data["submitted"])
+        await interaction.response.edit_message(embed=embed, view=view)
 
-    async def launch_group_action(self, session):
+    async def handle_lobby_reaction(self, payload, emoji, user):
+        session = self.group_sessions.get(payload.message_id)
+        if session is None:
+            return
+
+        message = session["message"]
+        print(f"[GROUP-LOBBY] Reaction from {user.display_name}: {emoji}")
+
+        self.group_sessions.touch(payload.message_id)
+        if emoji == REACTION_JOIN:
+            if user.id in session["members"]:
+                pass
+            elif self.bot.repo.ledger.has_acted(str(user.id)):
+                await message.channel.send(f"❌ {user.display_name} already did an action today.", delete_after=5)
+            else:
+                session["members"].add(user.id)
+                session["users"][user.id] = user
+                await message.channel.send(f"✅ {user.display_name} joined the group action!", delete_after=5)
+
+        elif emoji == REACTION_LAUNCH and user.id == session["leader"]:
+            self.group_sessions.pop(payload.message_id)
+            self.bot.reactions.unregister(payload.message_id)
+            await self.launch_group_action(session)
+            return
+
+        await message.remove_reaction(emoji, user)
+
+    async def handle_group_roll_reaction(self, payload, emoji, user):
+        data = self.active_group_rolls.get(payload.message_id)
+        if data is None:
+            return
+
+        user_id = user.id
+        if user_id not in data["members"]:
+            return  # Not a participant
+
+        message = data["message"]
+        pool = data["pool"]
+        submitted = data["submitted"]
+
+        print(f"[GROUP-ROLL] {user.display_name} reacted: {emoji}")
+        self.active_group_rolls.touch(payload.message_id)
+
+        if emoji == REACTION_SUBMIT:
+            submitted.add(user_id)
+            # Claim the roll before any await, so two last submits can't both settle it
+            finished = submitted == set(data["members"].keys())
+            if finished:
+                if self.active_group_rolls.pop(payload.message_id) is None:
+                    return  # another submit already settled this roll
+                self.bot.reactions.unregister(payload.message_id)
+
+            await message.channel.send(f"✅ {user.display_name} is ready!", delete_after=5)
+
+            if finished:
+                # All users submitted!
+                await self.bot.renderer.finish(payload.message_id)
+                await message.channel.send(embed=await self.settle_group(data))
+            return
+
+        if self.apply_group_change(data, user_id, emoji):
+            # Clicks from several members within the render window become one edit
+            self.bot.renderer.request(
+                message,
+                lambda: format_grouproll_embed(ACTIONS[data["action"]], pool, data["members"], submitted)
+            )
+            try:
+                await message.remove_reaction(emoji, user)
+            except Exception as e:
+                print(f"[ERROR] Failed to remove group roll reaction: {e}")
+
+    async def prepare_group_roll(self, session):
+        """Collect each member's skill points and roll the shared pool."""
         action_key = session["action"]
-        action_data = ACTIONS[action_key]
-        skill_required = action_data["skill"]
+        skill_required = ACTIONS[action_key]["skill"]
 
-        characters = load_characters()
+        repo = self.bot.repo
         members = {}
-        submitted = set()
+        skipped = {}  # user_id -> reason
 
-        # Gather skill data
+        eligible = []
         for user_id in session["members"]:
             user_id_str = str(user_id)
-            char = characters.get(user_id_str)
-            user_obj = await self.bot.fetch_user(user_id)
+            if user_id_str not in repo:
+                print(f"[GROUP] {user_id} has no character, skipping")
+                skipped[user_id] = "has no character"
+            elif repo.ledger.has_acted(user_id_str):
+                print(f"[GROUP] {user_id} already acted today, skipping")
+                skipped[user_id] = "already did an action today"
+            else:
+                eligible.append(user_id)
+
+        # Users who reacted or clicked are already known; the rest are resolved together
+        for user in session["users"].values():
+            self.members.remember(user)
+        users = await self.members.resolve(eligible)
 
-            if not char:
-                await session["message"].channel.send(f"❌ <@{user_id}> has no character.")
+        # Gather skill data
+        for user_id in eligible:
+            user_id_str = str(user_id)
+            char = repo.get(user_id_str)
+            user_obj = users.get(user_id)
+            if user_obj is None:
+                skipped[user_id] = "could not be found"
                 continue
 
             skill_value = char["skills"].get(skill_required, 0)
-            inventory = char.get("inventory", [])
-            equipped = [i[2:] for i in inventory if i.startswith("E:")]
-            tool_bonus = sum(
-                ITEMS.get(i, {}).get("bonus", {}).get(skill_required, 0)
-                for i in equipped if i in ITEMS
-            )
-            total_skill = skill_value + tool_bonus
+            total_skill = repo.skills.effective(user_id_str, skill_required)
+            tool_bonus = total_skill - skill_value
             print(f"[{user_obj.display_name}] Skill: {skill_value}, Tool: {tool_bonus}, Total: {total_skill}")
 
             members[user_id] = {
@@ -176,28 +383,31 @@ class GroupActions(commands.Cog):
                 "skill_points": total_skill
             }
 
-        # Shared roll pool
-        shared_rolls = roll_dice_pool(BASE_DICE * len(members))
-        history = [shared_rolls.copy()]
+        return {
+            "action": action_key,
+            "members": members,
+            "submitted": set(),
+            "skipped": skipped,
+            # Shared roll pool
+            "pool": DicePool.roll(BASE_DICE * len(members)),
+        }
+
+    async def launch_group_action(self, session):
+        data = await self.prepare_group_roll(session)
+        for user_id, reason in data["skipped"].items():
+            await session["message"].channel.send(f"❌ <@{user_id}> {reason}.")
 
-        # Create embed
-        embed = format_grouproll_embed(action_data, shared_rolls, members, history, submitted)
+        embed = format_grouproll_embed(ACTIONS[data["action"]], data["pool"], data["members"], data["submitted"])
         roll_msg = await session["message"].channel.send(embed=embed)
-        await roll_msg.add_reaction("➕")
-        await roll_msg.add_reaction("🔁")
-        await roll_msg.add_reaction("✅")
+        await roll_msg.add_reaction(REACTION_ADD)
+        await roll_msg.add_reaction(REACTION_REROLL)
+        await roll_msg.add_reaction(REACTION_SUBMIT)
 
         # Store for ongoing interaction
-        self.active_group_rolls = getattr(self, "active_group_rolls", {})
-        self.active_group_rolls[roll_msg.id] = {
-            "action": action_key,
-            "members": members,
-            "submitted": submitted,
-            "rolls": shared_rolls,
-            "history": history,
-            "message": roll_msg
-        }
-        
+        data["message"] = roll_msg
+        self.active_group_rolls.add(roll_msg.id, data)
+        self.bot.reactions.register(roll_msg.id, self.handle_group_roll_reaction)
+
 
 async def setup(bot):
     await bot.add_cog(GroupActions(bot))
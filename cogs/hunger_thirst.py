@@ -2,60 +2,108 @@
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
-from utils.io import load_characters, save_characters
-from utils.hunger_thirst import MAX_HUNGER, MAX_THIRST, update_hunger_thirst, eat, drink, get_hunger_thirst_percent
+from utils.alerts import AlertScheduler
+from utils.hunger_thirst import MAX_HUNGER, MAX_THIRST, now_epoch, update_hunger_thirst, tick_all, eat, drink, get_hunger_thirst_percent
 from utils.inventory import remove_item
+from utils.journal import hunger_ticked, item_removed
+
+TICK_INTERVAL_MINUTES = 10
+
+ALERT_MESSAGES = {
+    ("hunger", False): "🍗 **{name}** is getting hungry ({percent}%). Use `/eat` soon.",
+    ("hunger", True): "☠️ **{name}** is starving! Use `/eat` now.",
+    ("thirst", False): "💧 **{name}** is getting thirsty ({percent}%). Use `/drink` soon.",
+    ("thirst", True): "☠️ **{name}** is dehydrated! Use `/drink` now.",
+}
 
 class HungerThirst(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.alerts = AlertScheduler(bot.repo, self.send_alert)
+
+    async def cog_load(self):
+        self.hunger_tick.start()
+        self.alerts.schedule_all()
+        self.alerts.start()
+
+    async def cog_unload(self):
+        self.hunger_tick.cancel()
+        self.alerts.stop()
+
+    async def send_alert(self, user_id, char, stat, threshold):
+        """DM the owner when their character's hunger or thirst falls to a threshold."""
+        percent = get_hunger_thirst_percent(char)[f"{stat}_percent"]
+        message = ALERT_MESSAGES[(stat, threshold == 0)].format(name=char["name"], percent=percent)
+
+        user = self.bot.get_user(int(user_id)) or await self.bot.fetch_user(int(user_id))
+        try:
+            await user.send(message)
+        except discord.Forbidden:
+            print(f"⚠️ Can't DM {user_id} their {stat} alert (DMs closed).")
+
+    @tasks.loop(minutes=TICK_INTERVAL_MINUTES)
+    async def hunger_tick(self):
+        """Advance hunger/thirst for every character and persist them in one flush."""
+        repo = self.bot.repo
+        now = now_epoch()
+        changed = tick_all(repo.characters, now)
+        if changed:
+            repo.record(hunger_ticked(now), characters=changed)
+            await repo.request_flush()
+            print(f"⏱️ Hunger tick updated {len(changed)} character(s).")
 
     @app_commands.command(name="eat", description="Consume food to restore hunger.")
     async def eat_command(self, interaction: discord.Interaction, amount: int):
         user_id = str(interaction.user.id)
-        characters = load_characters()
+        repo = self.bot.repo
 
-        if user_id not in characters:
-            await interaction.response.send_message("You don't have a character yet.", ephemeral=True)
-            return
+        async with repo.transaction(user_id):
+            if user_id not in repo:
+                await interaction.response.send_message("You don't have a character yet.", ephemeral=True)
+                return
 
-        char = characters[user_id]
+            char = repo.get(user_id)
 
-        success, removed, _ = remove_item(char, "food", amount)
-        if not success:
-            await interaction.response.send_message(f"❌ You don't have enough food to eat ({removed}/{amount}).", ephemeral=True)
-            return
+            success, removed, _ = remove_item(char, "food", amount)
+            if not success:
+                await interaction.response.send_message(f"❌ You don't have enough food to eat ({removed}/{amount}).", ephemeral=True)
+                return
 
-        update_hunger_thirst(char)
-        eat(char, amount)
-        save_characters(characters)
+            repo.record(item_removed(user_id, "food", amount), inventories=[user_id])
+            update_hunger_thirst(char)
+            eat(char, amount)
+            repo.mark_dirty(user_id)
+            self.alerts.schedule(user_id)
 
-        percent = get_hunger_thirst_percent(char)["hunger_percent"]
+            percent = get_hunger_thirst_percent(char)["hunger_percent"]
         await interaction.response.send_message(f"🍗 You ate food and restored hunger. Hunger is now {percent}%.")
 
     @app_commands.command(name="drink", description="Consume water to restore thirst.")
     async def drink_command(self, interaction: discord.Interaction, amount: int):
         user_id = str(interaction.user.id)
-        characters = load_characters()
+        repo = self.bot.repo
 
-        if user_id not in characters:
-            await interaction.response.send_message("You don't have a character yet.", ephemeral=True)
-            return
+        async with repo.transaction(user_id):
+            if user_id not in repo:
+                await interaction.response.send_message("You don't have a character yet.", ephemeral=True)
+                return
 
-        char = characters[user_id]
+            char = repo.get(user_id)
 
-        success, removed, _ = remove_item(char, "water", amount)
-        if not success:
-            await interaction.response.send_message(f"❌ You don't have enough water to drink ({removed}/{amount}).", ephemeral=True)
-            return
+            success, removed, _ = remove_item(char, "water", amount)
+            if not success:
+                await interaction.response.send_message(f"❌ You don't have enough water to drink ({removed}/{amount}).", ephemeral=True)
+                return
 
-        update_hunger_thirst(char)
-        drink(char, amount)
-        save_characters(characters)
+            repo.record(item_removed(user_id, "water", amount), inventories=[user_id])
+            update_hunger_thirst(char)
+            drink(char, amount)
+            repo.mark_dirty(user_id)
+            self.alerts.schedule(user_id)
 
-        percent = get_hunger_thirst_percent(char)["thirst_percent"]
+            percent = get_hunger_thirst_percent(char)["thirst_percent"]
         await interaction.response.send_message(f"💧 You drank water and restored thirst. Thirst is now {percent}%.")
 
 async def setup(bot):
@@ -8,13 +8,12 @@ from discord.ext import commands
 import json
 import os
 
-from utils.items import ITEMS, normalize_item_name, ABSTRACT_RESOURCES
+from utils.items import ITEMS, ITEM_REGISTRY, RESOURCE_CATEGORY, normalize_item_name, ABSTRACT_RESOURCES
 from utils.inventory import transfer_item
+from utils.journal import item_transferred
 
 DATA_PATH = "data/characters.json"
 
-from utils.io import load_characters, save_characters
-from utils.base import load_base, save_base
 
 class Inventory(commands.Cog):
     def __init__(self, bot):
@@ -23,48 +22,46 @@ class Inventory(commands.Cog):
     @app_commands.command(name="equip", description="Equip an item from your inventory.")
     async def equip(self, interaction: discord.Interaction, item: str):
         user_id = str(interaction.user.id)
-        characters = load_characters()
+        repo = self.bot.repo
 
-        if user_id not in characters:
-            await interaction.response.send_message("You have no character.", ephemeral=True)
-            return
+        async with repo.transaction(user_id):
+            if user_id not in repo:
+                await interaction.response.send_message("You have no character.", ephemeral=True)
+                return
 
-        char = characters[user_id]
-        inv = char["inventory"]
+            char = repo.get(user_id)
+            inv = char["inventory"]
 
-        if f"E:{item}" in inv:
-            await interaction.response.send_message("You're already using that.", ephemeral=True)
-            return
+            if inv.is_equipped(item):
+                await interaction.response.send_message("You're already using that.", ephemeral=True)
+                return
 
-        if item not in inv:
-            await interaction.response.send_message("That item isn't in your inventory.", ephemeral=True)
-            return
+            if not inv.equip(item):
+                await interaction.response.send_message("That item isn't in your inventory.", ephemeral=True)
+                return
 
-        inv.remove(item)
-        inv.append(f"E:{item}")
-        save_characters(characters)
+            repo.mark_inventory_dirty(user_id)
 
         await interaction.response.send_message(f"✅ Equipped **{item}**.", ephemeral=True)
 
     @app_commands.command(name="unequip", description="Unequip an equipped item.")
     async def unequip(self, interaction: discord.Interaction, item: str):
         user_id = str(interaction.user.id)
-        characters = load_characters()
+        repo = self.bot.repo
 
-        if user_id not in characters:
-            await interaction.response.send_message("You have no character.", ephemeral=True)
-            return
+        async with repo.transaction(user_id):
+            if user_id not in repo:
+                await interaction.response.send_message("You have no character.", ephemeral=True)
+                return
 
-        char = characters[user_id]
-        inv = char["inventory"]
+            char = repo.get(user_id)
+            inv = char["inventory"]
 
-        if f"E:{item}" not in inv:
-            await interaction.response.send_message("You're not using that item.", ephemeral=True)
-            return
+            if not inv.unequip(item):
+                await interaction.response.send_message("You're not using that item.", ephemeral=True)
+                return
 
-        inv.remove(f"E:{item}")
-        inv.append(item)
-        save_characters(characters)
+            repo.mark_inventory_dirty(user_id)
 
         await interaction.response.send_message(f"🛑 Unequipped **{item}**.", ephemeral=True)
     
@@ -77,18 +74,19 @@ class Inventory(commands.Cog):
     async def give(self, interaction: discord.Interaction, target: discord.User, item: str, amount: int = 1):
         giver_id = str(interaction.user.id)
         receiver_id = str(target.id)
-        characters = load_characters()
+        repo = self.bot.repo
 
-        if giver_id not in characters or receiver_id not in characters:
-            await interaction.response.send_message("Both users must have characters.", ephemeral=True)
-            return
+        async with repo.transaction(giver_id, receiver_id):
+            if giver_id not in repo or receiver_id not in repo:
+                await interaction.response.send_message("Both users must have characters.", ephemeral=True)
+                return
 
-        success, count, item_name = transfer_item(characters, giver_id, receiver_id, item, amount)
-        if not success:
-            await interaction.response.send_message(f"❌ You don't have enough **{item_name.title()}** to give.", ephemeral=True)
-            return
+            success, count, item_name = transfer_item(repo.characters, giver_id, receiver_id, item, amount)
+            if not success:
+                await interaction.response.send_message(f"❌ You don't have enough **{item_name.title()}** to give.", ephemeral=True)
+                return
 
-        save_characters(characters)
+            repo.record(item_transferred(giver_id, receiver_id, item_name, count), inventories=[giver_id, receiver_id])
         await interaction.response.send_message(f"🎁 You gave {target.display_name} **{count}x {item_name.title()}**.", ephemeral=False)
         
     @app_commands.command(name="store", description="Store an item in the base inventory.")
@@ -101,27 +99,23 @@ class Inventory(commands.Cog):
         print(f"🛠️ /store command triggered by user {interaction.user.display_name} ({user_id})")
         print(f"📦 Item: {item}, Amount: {amount}")
 
-        characters = load_characters()
-        base = load_base()
+        repo = self.bot.repo
 
-        print(f"🔍 Loaded character data: {'yes' if user_id in characters else 'no'}")
-        print(f"🏕️ Loaded base inventory: {base.get('inventory', [])}")
+        async with repo.transaction(user_id, "base"):
+            if user_id not in repo:
+                print(f"❌ Character for user {user_id} not found.")
+                await interaction.response.send_message("❌ You have no character.", ephemeral=True)
+                return
 
-        if user_id not in characters:
-            print(f"❌ Character for user {user_id} not found.")
-            await interaction.response.send_message("❌ You have no character.", ephemeral=True)
-            return
-
-        success, count, item_name = transfer_item(characters, user_id, "base", item, amount, base)
-        print(f"🔄 transfer_item result: success={success}, count={count}, item_name={item_name}")
+            success, count, item_name = transfer_item(repo.characters, user_id, "base", item, amount, repo.base)
+            print(f"🔄 transfer_item result: success={success}, count={count}, item_name={item_name}")
 
-        if not success:
-            print(f"❌ Transfer failed. User does not have enough '{item_name}'.")
-            await interaction.response.send_message(f"❌ You don't have enough **{item_name.title()}** to store.", ephemeral=True)
-            return
+            if not success:
+                print(f"❌ Transfer failed. User does not have enough '{item_name}'.")
+                await interaction.response.send_message(f"❌ You don't have enough **{item_name.title()}** to store.", ephemeral=True)
+                return
 
-        save_characters(characters)
-        save_base(base)
+            repo.record(item_transferred(user_id, "base", item_name, count), inventories=[user_id, "base"])
         print(f"✅ Stored {count}x {item_name} to base inventory")
 
         await interaction.response.send_message(f"📦 Stored **{count}x {item_name.title()}** in base inventory.", ephemeral=False)
@@ -133,50 +127,44 @@ class Inventory(commands.Cog):
     )
     async def take(self, interaction: discord.Interaction, item: str, amount: int = 1):
         user_id = str(interaction.user.id)
-        characters = load_characters()
-        base = load_base()
+        repo = self.bot.repo
 
-        if user_id not in characters:
-            await interaction.response.send_message("❌ You have no character.", ephemeral=True)
-            return
+        async with repo.transaction(user_id, "base"):
+            if user_id not in repo:
+                await interaction.response.send_message("❌ You have no character.", ephemeral=True)
+                return
 
-        success, count, item_name = transfer_item(characters, "base", user_id, item, amount, base)
-        if not success:
-            await interaction.response.send_message(f"❌ Base doesn't have enough **{item_name.title()}** to take.", ephemeral=True)
-            return
+            success, count, item_name = transfer_item(repo.characters, "base", user_id, item, amount, repo.base)
+            if not success:
+                await interaction.response.send_message(f"❌ Base doesn't have enough **{item_name.title()}** to take.", ephemeral=True)
+                return
 
-        save_characters(characters)
-        save_base(base)
+            repo.record(item_transferred("base", user_id, item_name, count), inventories=[user_id, "base"])
 
         await interaction.response.send_message(f"📥 Took **{count}x {item_name.title()}** from base inventory.", ephemeral=False)
     
     @app_commands.command(name="storage", description="View items stored in the base inventory.")
     async def storage(self, interaction: discord.Interaction):
-        base = load_base()
-        print("🔍 base loaded:", base)
-        print("🔍 type of base:", type(base))
-        inventory = base.get("inventory", [])
+        inventory = self.bot.repo.base["inventory"]
 
         if not inventory:
             await interaction.response.send_message("📦 The base inventory is currently empty.", ephemeral=True)
             return
-            
-        # Count items
-        item_counts = {}
-        for item in inventory:
-            item_counts[item] = item_counts.get(item, 0) + 1
+
+        # Live per-item totals (carried + equipped), kept up to date by every
+        # store/take/loot write, so this is one pass over distinct items
+        summary = inventory.track()
 
         # Separate abstract resources from gear
         abstract_lines = []
         other_lines = []
 
-        for item, count in item_counts.items():
-            item_key = item.lower()
-            if item_key in ABSTRACT_RESOURCES:
-                emoji_label = ABSTRACT_RESOURCES[item_key]
+        for item_id, count in summary.items.items():
+            if ITEM_REGISTRY.categories[item_id] == RESOURCE_CATEGORY:
+                emoji_label = ABSTRACT_RESOURCES[ITEM_REGISTRY.keys[item_id]]
                 abstract_lines.append(f"{emoji_label}: **{count} units**")
             else:
-                other_lines.append(f"• {item} x{count}")
+                other_lines.append(f"• {ITEM_REGISTRY.names[item_id]} x{count}")
 
         # Create embed
         embed = discord.Embed(
@@ -188,7 +176,8 @@ class Inventory(commands.Cog):
             embed.add_field(name="📊 Resources", value="\n".join(abstract_lines), inline=False)
 
         if other_lines:
-            embed.add_field(name="📦 Items", value="\n".join(other_lines), inline=False)
+            gear_units = sum(units for category, units in summary.categories.items() if category != RESOURCE_CATEGORY)
+            embed.add_field(name=f"📦 Items ({gear_units} total)", value="\n".join(other_lines), inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
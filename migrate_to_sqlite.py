@@ -0,0 +1,5 @@
+from utils.storage import SQLITE_PATH, migrate_json_to_sqlite
+
+count = migrate_json_to_sqlite()
+print(f"✅ Migrated {count} character(s) and the base stash to {SQLITE_PATH}.")
+print("Set BATHALA_STORAGE=sqlite to run the bot on the new backend.")
@@ -1,8 +1,8 @@
-from datetime import datetime
+import time
 from utils.io import load_characters, save_characters  # adjust if needed
 
 characters = load_characters()
-now = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+now = int(time.time())
 
 for char in characters.values():
     char["last_tick"] = now
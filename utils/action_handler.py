@@ -1,33 +1,93 @@
 # utils/action_handler.py
 
-from utils.items import roll_loot, format_loot, ABSTRACT_RESOURCES
-from utils.io import load_characters, save_characters
+from utils.items import roll_loot, format_loot
+from utils.journal import loot_granted
 
-def handle_scavenge(user_id, successes):
+def handle_scavenge(repo, user_id, successes):
     loot = roll_loot(successes)
     loot_text = format_loot(loot)
 
-    characters = load_characters()
-    char = characters.get(user_id)
+    char = repo.get(user_id)
     if not char:
         return "⚠️ Character not found."
 
-    inventory = char.setdefault("inventory", [])
+    inventory = char["inventory"]
 
     for item, amt in loot:
-        item_key = item.lower()
-        if item_key in ABSTRACT_RESOURCES:
-            inventory.extend([item_key] * amt)
-        else:
-            inventory.extend([item] * amt)
+        inventory.add(item, amt)
 
-    save_characters(characters)
+    repo.record(loot_granted(user_id, loot), inventories=[user_id])
     return loot_text
 
 
+# --- Group settlement ---
+
+GROUP_LOOT_BASE = "base"        # everything goes to the camp stash
+GROUP_LOOT_MEMBERS = "members"  # units are dealt out evenly across members
+GROUP_LOOT_RULES = (GROUP_LOOT_BASE, GROUP_LOOT_MEMBERS)
+
+def split_loot(loot, member_ids, rule=GROUP_LOOT_BASE):
+    """
+    Decide who receives what from one pooled loot roll.
+
+    Returns:
+        {owner_id: {item: amount}}, where owner_id is a member id or "base".
+    """
+    totals = {}
+    for item, amt in loot:
+        totals[item] = totals.get(item, 0) + amt
+
+    if rule == GROUP_LOOT_BASE or not member_ids:
+        return {"base": totals} if totals else {}
+    if rule != GROUP_LOOT_MEMBERS:
+        raise ValueError(f"Unknown group loot rule '{rule}'. Choose from: {', '.join(GROUP_LOOT_RULES)}")
+
+    # Even shares per item; leftover units continue round-robin across items
+    shares = {member_id: {} for member_id in member_ids}
+    count = len(member_ids)
+    turn = 0
+    for item, amt in totals.items():
+        each, leftover = divmod(amt, count)
+        for i, member_id in enumerate(member_ids):
+            extra = 1 if (i - turn) % count < leftover else 0
+            if each + extra:
+                shares[member_id][item] = each + extra
+        turn = (turn + leftover) % count
+    return {member_id: items for member_id, items in shares.items() if items}
+
+def handle_group_scavenge(repo, member_ids, successes, rule=GROUP_LOOT_BASE):
+    """
+    Roll loot once for the pooled successes and hand it out by `rule`.
+
+    All inventories are updated in memory here; the caller holds the
+    transaction and persists the batch with a single flush.
+    """
+    loot = roll_loot(successes)
+    if not loot:
+        return "Nothing found."
+
+    lines = []
+    for owner_id, items in split_loot(loot, member_ids, rule).items():
+        owner = repo.base if owner_id == "base" else repo.get(owner_id)
+        if owner is None:
+            continue
+        inventory = owner["inventory"]
+        for item, amt in items.items():
+            inventory.add(item, amt)
+        repo.record(loot_granted(owner_id, items), inventories=[owner_id])
+
+        label = "🏕️ Base" if owner_id == "base" else f"<@{owner_id}>"
+        lines.append(f"{label}: " + ", ".join(f"{item} x{amt}" for item, amt in items.items()))
+
+    return f"{format_loot(loot)}\n\n" + "\n".join(lines)
+
 
 # Register handlers by action key
 ACTION_HANDLERS = {
     "scavenge": handle_scavenge,
     # "cook": handle_cook, etc.
 }
+
+GROUP_ACTION_HANDLERS = {
+    "scavenge": handle_group_scavenge,
+}
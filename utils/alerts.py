@@ -0,0 +1,189 @@
+# utils/alerts.py
+
+import asyncio
+import heapq
+import itertools
+import math
+
+from utils.camp import LOW_FRACTION
+from utils.hunger_thirst import MAX_HUNGER, MAX_THIRST, SECONDS_PER_HOUR, now_epoch, update_hunger_thirst
+
+# Alert thresholds per stat, highest first. The low one is where a character
+# enters the "hungry"/"thirsty" bucket of the camp report (utils/camp.py).
+THRESHOLDS = {
+    "hunger": (math.ceil(MAX_HUNGER * LOW_FRACTION) - 1, 0),
+    "thirst": (math.ceil(MAX_THIRST * LOW_FRACTION) - 1, 0),
+}
+MAXIMUMS = {"hunger": MAX_HUNGER, "thirst": MAX_THIRST}
+
+def next_crossing(char):
+    """
+    When the character's hunger or thirst next falls to a threshold.
+
+    Decay is 1 point per whole hour after last_tick, so a stat at `value`
+    reaches `threshold` exactly (value - threshold) hours after last_tick.
+
+    Returns:
+        (epoch seconds, stat, threshold), or None if both stats are at 0
+    """
+    last_tick = char.get("last_tick")
+    if last_tick is None:
+        return None
+
+    best = None
+    for stat, thresholds in THRESHOLDS.items():
+        value = char.get(stat, MAXIMUMS[stat])
+        for threshold in thresholds:
+            if value > threshold:
+                at = last_tick + (value - threshold) * SECONDS_PER_HOUR
+                if best is None or at < best[0]:
+                    best = (at, stat, threshold)
+                break
+    return best
+
+
+class AlertScheduler:
+    """
+    Fires an alert when a character's hunger or thirst falls to a threshold.
+
+    Every character has one heap entry: the time of its next crossing (see
+    next_crossing). The background task sleeps until the earliest one, brings
+    that character's hunger/thirst up to date, calls on_alert(user_id, char,
+    stat, threshold) for each stat that fell to a threshold (the lowest one
+    it passed) and re-keys the character for its next crossing - no polling,
+    so an idle camp costs one sleeping task however big it is.
+
+    schedule() re-keys a character in O(log n) after anything that changes
+    its hunger/thirst other than decay (eating, drinking, creation). As in
+    SessionStore, the old heap entry is left behind and skipped when it
+    surfaces. Hunger ticks don't move crossings, so they need no re-key.
+    """
+
+    def __init__(self, repo, on_alert=None, clock=now_epoch):
+        self.repo = repo
+        self.on_alert = on_alert
+        self.clock = clock
+        self._crossings = {}  # user_id -> epoch of the next crossing
+        self._heap = []       # (at, seq, user_id), may hold stale entries
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._task = None
+        self.fired = 0
+
+    def __len__(self):
+        return len(self._crossings)
+
+    def schedule(self, user_id):
+        """(Re)compute a character's next crossing. Unknown ids are dropped."""
+        char = self.repo.get(user_id)
+        crossing = next_crossing(char) if char is not None else None
+        if crossing is None:
+            self._crossings.pop(user_id, None)
+            return
+        at = crossing[0]
+        if self._crossings.get(user_id) == at:
+            return
+
+        earliest = self.next_deadline()
+        self._crossings[user_id] = at
+        heapq.heappush(self._heap, (at, next(self._seq), user_id))
+        if len(self._heap) > 2 * len(self._crossings) + 64:
+            self._compact()
+        if earliest is None or at < earliest:
+            self._wake.set()  # the loop may be sleeping past this one
+
+    def schedule_all(self):
+        """Rebuild the heap from every character in the repository (O(n))."""
+        self._crossings = {}
+        for user_id, char in self.repo.characters.items():
+            crossing = next_crossing(char)
+            if crossing is not None:
+                self._crossings[user_id] = crossing[0]
+        self._compact()
+        self._wake.set()
+
+    def _compact(self):
+        self._heap = [(at, next(self._seq), user_id) for user_id, at in self._crossings.items()]
+        heapq.heapify(self._heap)
+
+    def next_deadline(self):
+        """Epoch of the earliest live crossing, or None if nothing is scheduled."""
+        heap = self._heap
+        while heap and self._crossings.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def due(self, now=None):
+        """Remove and return the ids of every character with a crossing at or before now."""
+        now = self.clock() if now is None else now
+        due = []
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                break
+            _, _, user_id = heapq.heappop(self._heap)
+            del self._crossings[user_id]
+            due.append(user_id)
+        return due
+
+    async def fire(self, now=None):
+        """Apply decay to every character with a due crossing, alert, and re-key them."""
+        now = self.clock() if now is None else now
+        alerts = []
+        for user_id in self.due(now):
+            async with self.repo.transaction(user_id):
+                char = self.repo.get(user_id)
+                if char is None:
+                    continue
+                before = {stat: char.get(stat, MAXIMUMS[stat]) for stat in THRESHOLDS}
+                update_hunger_thirst(char, now)
+                self.repo.mark_dirty(user_id)
+                self.schedule(user_id)
+
+                # Both stats can cross in the same hour, and a long gap (e.g.
+                # downtime) can pass several thresholds: report the lowest.
+                for stat, thresholds in THRESHOLDS.items():
+                    crossed = [t for t in thresholds if char.get(stat, MAXIMUMS[stat]) <= t < before[stat]]
+                    if crossed:
+                        alerts.append((user_id, char, stat, crossed[-1]))
+
+        for user_id, char, stat, threshold in alerts:
+            self.fired += 1
+            if self.on_alert is not None:
+                try:
+                    await self.on_alert(user_id, char, stat, threshold)
+                except Exception as e:
+                    print(f"❌ Failed to send {stat} alert to {user_id}: {e}")
+        return len(alerts)
+
+    # --- Background task ---
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            self._wake.clear()
+            deadline = self.next_deadline()
+            if deadline is None or deadline > self.clock():
+                delay = None if deadline is None else deadline - self.clock()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                    continue  # re-keyed earlier (or rebuilt); look again
+                except asyncio.TimeoutError:
+                    pass
+
+            try:
+                sent = await self.fire()
+            except Exception as e:
+                print(f"❌ Alert scheduler failed: {e}")
+                await asyncio.sleep(1)
+                continue
+            if sent:
+                print(f"🔔 Sent {sent} hunger/thirst alert(s) ({len(self)} character(s) scheduled).")
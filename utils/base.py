@@ -3,14 +3,16 @@
 import json
 import os
 
+from utils.io import write_json_atomic
+
 BASE_PATH = "data/base.json"
 
-def load_base():
-    if not os.path.exists(BASE_PATH):
+def load_base(path=BASE_PATH):
+    if not os.path.exists(path):
         print("📂 No base file found. Creating new one.")
         return {"inventory": []}
     try:
-        with open(BASE_PATH, "r") as f:
+        with open(path, "r") as f:
             data = json.load(f)
             if "inventory" not in data:
                 print("🔧 No 'inventory' key found. Initializing empty list.")
@@ -21,10 +23,9 @@ def load_base():
         return {"inventory": []}
 
 
-def save_base(data):
+def save_base(data, path=BASE_PATH):
     try:
-        with open("data/base.json", "w") as f:
-            json.dump(data, f, indent=2)
+        write_json_atomic(path, data)
     except Exception as e:
         print("⚠️ Error saving base data:", e)
         raise
@@ -0,0 +1,133 @@
+# utils/camp.py
+
+from utils.constants import SKILLS
+from utils.hunger_thirst import MAX_HUNGER, MAX_THIRST
+from utils.inventory import StashSummary
+from utils.items import ABSTRACT_RESOURCES, ITEM_REGISTRY
+
+RESOURCE_KEYS = list(ABSTRACT_RESOURCES)
+RESOURCE_IDS = [ITEM_REGISTRY.find(key) for key in RESOURCE_KEYS]
+
+# Hunger/thirst buckets: 0 = empty, 1 = below LOW_FRACTION of max, 2 = fine
+LOW_FRACTION = 0.25
+HUNGER_BUCKETS = ("starving", "hungry", "fed")
+THIRST_BUCKETS = ("dehydrated", "thirsty", "hydrated")
+
+def _bucket(value, maximum):
+    if value <= 0:
+        return 0
+    if value < maximum * LOW_FRACTION:
+        return 1
+    return 2
+
+def _bump(counts, key, delta):
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
+
+def contribution(char):
+    """What one character adds to the camp totals, as a comparable tuple."""
+    inventory = char["inventory"]
+    return (
+        tuple(inventory.count(item_id) for item_id in RESOURCE_IDS),
+        _bucket(char.get("hunger", MAX_HUNGER), MAX_HUNGER),
+        _bucket(char.get("thirst", MAX_THIRST), MAX_THIRST),
+        tuple(char["skills"].get(skill, 0) for skill in SKILLS),
+        tuple(inventory.equipped.items()),
+    )
+
+
+class CampIndex:
+    """
+    Camp-wide totals across all survivors, kept current on every write.
+
+    The repository calls refresh() with the ids it persists (mark_dirty,
+    mark_inventory_dirty, record), so the index sees every change that is
+    saved. Each character's last contribution is remembered; a refresh
+    subtracts it and adds the new one, which costs the size of one character,
+    not the camp. Reading the totals never scans characters.
+
+    Totals:
+        survivors: number of characters
+        resources: units of each ABSTRACT_RESOURCES key held by survivors
+        hunger / thirst: characters per bucket (see HUNGER_BUCKETS)
+        skills: per skill, {base level: characters}
+        equipped: {item id: equipped units}
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._contributions = {}  # user_id -> contribution tuple
+        self.survivors = 0
+        self.resources = [0] * len(RESOURCE_KEYS)
+        self.hunger = [0] * len(HUNGER_BUCKETS)
+        self.thirst = [0] * len(THIRST_BUCKETS)
+        self.skills = [{} for _ in SKILLS]
+        self.equipped = {}
+        self.refresh(*repo.characters)
+
+    def _apply(self, contrib, sign):
+        resources, hunger, thirst, skills, equipped = contrib
+        self.survivors += sign
+        for i, units in enumerate(resources):
+            self.resources[i] += sign * units
+        self.hunger[hunger] += sign
+        self.thirst[thirst] += sign
+        for histogram, level in zip(self.skills, skills):
+            _bump(histogram, level, sign)
+        for item_id, units in equipped:
+            _bump(self.equipped, item_id, sign * units)
+
+    def refresh(self, *entity_ids):
+        """Re-read the given characters ("base" and unknown ids are fine)."""
+        for entity_id in entity_ids:
+            if entity_id == "base":
+                continue  # the base stash keeps its own StashSummary
+            char = self.repo.get(entity_id)
+            new = contribution(char) if char is not None else None
+            old = self._contributions.get(entity_id)
+            if new == old:
+                continue
+            if old is not None:
+                self._apply(old, -1)
+            if new is None:
+                del self._contributions[entity_id]
+            else:
+                self._apply(new, 1)
+                self._contributions[entity_id] = new
+
+    def totals(self):
+        """Plain-data copy of every total, keyed by readable names."""
+        names = ITEM_REGISTRY.names
+        return {
+            "survivors": self.survivors,
+            "resources": dict(zip(RESOURCE_KEYS, self.resources)),
+            "hunger": dict(zip(HUNGER_BUCKETS, self.hunger)),
+            "thirst": dict(zip(THIRST_BUCKETS, self.thirst)),
+            "skills": {skill: dict(sorted(histogram.items())) for skill, histogram in zip(SKILLS, self.skills)},
+            "equipped": {names[item_id]: units for item_id, units in self.equipped.items()},
+        }
+
+    def verify(self):
+        """
+        Check the live totals against a full rescan of the repository.
+
+        Also checks the base stash summary against its stacks.
+
+        Returns:
+            list of human-readable mismatches (empty when consistent)
+        """
+        problems = []
+        live, fresh = self.totals(), CampIndex(self.repo).totals()
+        for name in fresh:
+            if live[name] != fresh[name]:
+                problems.append(f"{name}: index {live[name]} != rescan {fresh[name]}")
+
+        base_inventory = self.repo.base["inventory"]
+        if base_inventory.summary is not None:
+            rescan = StashSummary.of(base_inventory)
+            if rescan.items != base_inventory.summary.items or rescan.categories != base_inventory.summary.categories:
+                problems.append("base stash summary does not match its stacks")
+        return problems
@@ -1,6 +1,9 @@
 # utils/constants.py
 
-from datetime import datetime
+import time
+
+from utils.inventory import Stash, parse_stack
+from utils.items import ITEM_REGISTRY
 
 STARTING_HP = 100
 STARTING_SKILL_POINTS = 5
@@ -23,13 +26,13 @@ def get_default_character():
         "hp": STARTING_HP,
         "injury": None,
         "skills": {skill: 0 for skill in SKILLS},
-        "inventory": [],
+        "inventory": Stash(),
         "unallocated_points": 5,
         "allocated": False,
         "image": None,
         "hunger": 120,
         "thirst": 72,
-        "last_tick": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S"),
+        "last_tick": int(time.time()),
     }
 
 BACKGROUNDS = {
@@ -92,3 +95,7 @@ BACKGROUNDS = {
         "equipment": ["E:Pistol", "Ammo x10", "Combat Knife", "Bandage"]
     }
 }
+
+for _background in BACKGROUNDS.values():
+    for _entry in _background["equipment"]:
+        ITEM_REGISTRY.register(parse_stack(_entry)[0])
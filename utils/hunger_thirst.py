@@ -1,8 +1,12 @@
 # utils/hunger_thirst.py
 
+import time
 from datetime import datetime, timedelta
 
-from utils.io import load_characters, save_characters
+try:
+    import numpy as np
+except ImportError:  # batch ticks fall back to a plain loop
+    np = None
 
 MAX_HUNGER = 120
 MAX_THIRST = 72
@@ -10,19 +14,33 @@ MAX_THIRST = 72
 HUNGER_PER_FOOD = 24
 THIRST_PER_DRINK = 24
 
-def update_hunger_thirst(character, current_time=None):
-    if current_time is None:
-        current_time = datetime.utcnow()
+SECONDS_PER_HOUR = 3600
 
-    last_tick_str = character.get("last_tick")
-    if not last_tick_str:
-        character["last_tick"] = current_time.strftime("%Y-%m-%dT%H:%M:%S")
-        return character
+# Format of the old string timestamps, kept only to migrate existing saves.
+LEGACY_TICK_FORMAT = "%Y-%m-%dT%H:%M:%S"
+EPOCH = datetime(1970, 1, 1)
+
+def now_epoch():
+    return int(time.time())
 
-    last_tick = datetime.strptime(last_tick_str, "%Y-%m-%dT%H:%M:%S")
-    elapsed = current_time - last_tick
-    elapsed_hours = int(elapsed.total_seconds() // 3600)
+def upgrade_last_tick(character):
+    """Migrate a "%Y-%m-%dT%H:%M:%S" UTC last_tick string to integer epoch seconds."""
+    last_tick = character.get("last_tick")
+    if isinstance(last_tick, str):
+        character["last_tick"] = (datetime.strptime(last_tick, LEGACY_TICK_FORMAT) - EPOCH) // timedelta(seconds=1)
+    return character
 
+def update_hunger_thirst(character, now=None):
+    """Apply whole hours of decay since last_tick. `now` is epoch seconds."""
+    if now is None:
+        now = now_epoch()
+
+    last_tick = character.get("last_tick")
+    if last_tick is None:
+        character["last_tick"] = now
+        return character
+
+    elapsed_hours = (now - last_tick) // SECONDS_PER_HOUR
     if elapsed_hours <= 0:
         return character
 
@@ -30,11 +48,66 @@ def update_hunger_thirst(character, current_time=None):
     character["thirst"] = max(0, character.get("thirst", MAX_THIRST) - elapsed_hours)
 
     # Update to the last full hour mark
-    new_tick = last_tick + timedelta(hours=elapsed_hours)
-    character["last_tick"] = new_tick.strftime("%Y-%m-%dT%H:%M:%S")
+    character["last_tick"] = last_tick + elapsed_hours * SECONDS_PER_HOUR
 
     return character
 
+def tick_all(characters, now=None):
+    """
+    Advance hunger and thirst for every character at once.
+
+    Builds a column view (hunger, thirst, last-tick epoch) of all characters,
+    applies the whole-hour decay to the columns, and writes back only the rows
+    that changed. Uses NumPy when it is installed.
+
+    Returns:
+        list of character ids whose hunger/thirst/last_tick changed
+    """
+    if now is None:
+        now = now_epoch()
+
+    changed = []
+    ticked_ids = []
+    for char_id, char in characters.items():
+        if char.get("last_tick") is None:
+            char["last_tick"] = now
+            changed.append(char_id)
+        else:
+            ticked_ids.append(char_id)
+
+    if not ticked_ids:
+        return changed
+
+    if np is None:
+        for char_id in ticked_ids:
+            char = characters[char_id]
+            last_tick = char["last_tick"]
+            update_hunger_thirst(char, now)
+            if char["last_tick"] != last_tick:
+                changed.append(char_id)
+        return changed
+
+    rows = [characters[char_id] for char_id in ticked_ids]
+    count = len(rows)
+    hunger = np.fromiter((c.get("hunger", MAX_HUNGER) for c in rows), dtype=np.int64, count=count)
+    thirst = np.fromiter((c.get("thirst", MAX_THIRST) for c in rows), dtype=np.int64, count=count)
+    last = np.fromiter((c["last_tick"] for c in rows), dtype=np.int64, count=count)
+
+    elapsed_hours = np.maximum((now - last) // SECONDS_PER_HOUR, 0)
+    hunger = np.maximum(hunger - elapsed_hours, 0)
+    thirst = np.maximum(thirst - elapsed_hours, 0)
+    last = last + elapsed_hours * SECONDS_PER_HOUR
+
+    moved = np.flatnonzero(elapsed_hours)
+    for i, h, t, tick in zip(moved.tolist(), hunger[moved].tolist(), thirst[moved].tolist(), last[moved].tolist()):
+        char = rows[i]
+        char["hunger"] = h
+        char["thirst"] = t
+        char["last_tick"] = tick
+        changed.append(ticked_ids[i])
+
+    return changed
+
 def eat(character, food_value):
     character["hunger"] = min(MAX_HUNGER, character.get("hunger", MAX_HUNGER) + (food_value * HUNGER_PER_FOOD))
     return character
@@ -43,9 +116,24 @@ def drink(character, water_value):
     character["thirst"] = min(MAX_THIRST, character.get("thirst", MAX_THIRST) + (water_value * THIRST_PER_DRINK))
     return character
 
-def get_hunger_thirst_percent(character):
+def project_hunger_thirst(character, now):
+    """(hunger, thirst) at epoch `now`, without touching the character."""
     hunger = character.get("hunger", MAX_HUNGER)
     thirst = character.get("thirst", MAX_THIRST)
+    last_tick = character.get("last_tick")
+    if last_tick is not None and now > last_tick:
+        elapsed_hours = (now - last_tick) // SECONDS_PER_HOUR
+        hunger = max(0, hunger - elapsed_hours)
+        thirst = max(0, thirst - elapsed_hours)
+    return hunger, thirst
+
+def get_hunger_thirst_percent(character, now=None):
+    """Hunger/thirst as % of max. Pass `now` to include decay not yet applied."""
+    if now is None:
+        hunger = character.get("hunger", MAX_HUNGER)
+        thirst = character.get("thirst", MAX_THIRST)
+    else:
+        hunger, thirst = project_hunger_thirst(character, now)
     return {
         "hunger_percent": round(hunger / MAX_HUNGER * 100, 1),
         "thirst_percent": round(thirst / MAX_THIRST * 100, 1)
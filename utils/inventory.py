@@ -1,17 +1,263 @@
 # utils/inventory.py
 
-from utils.items import normalize_item_name, ABSTRACT_RESOURCES
+import re
+
+from utils.items import ITEM_REGISTRY, normalize_item_name
+
+# "Arrows x10" -> ("Arrows", 10)
+STACK_PATTERN = re.compile(r"^(.+?) x(\d+)$")
+
+def parse_stack(entry):
+    """Split stack notation into (name, count). Plain names count as 1."""
+    match = STACK_PATTERN.match(entry)
+    if match:
+        return match.group(1), int(match.group(2))
+    return entry, 1
+
+
+def _find(item):
+    """Registry id for an item name (ids and None pass through), or None if unknown."""
+    return item if item is None or type(item) is int else ITEM_REGISTRY.find(item)
+
+
+class StashSummary:
+    """
+    Live aggregates for one Stash: units per item (carried and equipped
+    together) and units per registry category.
+
+    The Stash updates it on every add/take, so readers like /storage get
+    the totals without recounting.
+    """
+
+    __slots__ = ("items", "categories")
+
+    def __init__(self):
+        self.items = {}       # item id -> units
+        self.categories = {}  # category -> units
+
+    @classmethod
+    def of(cls, stash):
+        summary = cls()
+        for stacks in (stash.carried, stash.equipped):
+            for item_id, count in stacks.items():
+                summary.update(item_id, count)
+        return summary
+
+    def update(self, item_id, delta):
+        units = self.items.get(item_id, 0) + delta
+        if units > 0:
+            self.items[item_id] = units
+        else:
+            self.items.pop(item_id, None)
+
+        category = ITEM_REGISTRY.categories[item_id]
+        units = self.categories.get(category, 0) + delta
+        if units > 0:
+            self.categories[category] = units
+        else:
+            self.categories.pop(category, None)
+
+
+class Stash:
+    """
+    Counted-stack inventory for a character or the base.
+
+    Items are stored as {item id: count} using the ids from ITEM_REGISTRY,
+    with equipped ("E:") items tracked separately from carried ones. Adding
+    or taking any amount of one item type is O(1), and every method accepts
+    either an item name (any spelling) or its id.
+
+    equip_version increases whenever the equipped stacks change, so caches
+    built from equipment (see utils/skills.py) can tell when they are stale.
+
+    Stashes that are read in aggregate (the base) can track() a StashSummary,
+    which every later mutation keeps up to date.
+    """
+
+    __slots__ = ("carried", "equipped", "equip_version", "summary")
+
+    def __init__(self):
+        self.carried = {}   # item id -> count
+        self.equipped = {}  # item id -> count
+        self.equip_version = 0
+        self.summary = None
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Build a Stash from saved data.
+
+        Accepts the current {"items": {...}, "equipped": {...}} format as well as
+        old flat lists like ["food", "food", "E:Crowbar", "Arrows x10"].
+        """
+        if isinstance(data, Stash):
+            return data
+
+        stash = cls()
+        if isinstance(data, dict):
+            for name, count in data.get("items", {}).items():
+                stash.add(name, count)
+            for name, count in data.get("equipped", {}).items():
+                stash.add(name, count, equipped=True)
+            return stash
+
+        for entry in data or []:
+            equipped = entry.startswith("E:")
+            name, count = parse_stack(entry[2:] if equipped else entry)
+            stash.add(name, count, equipped=equipped)
+        return stash
+
+    def to_data(self):
+        names = ITEM_REGISTRY.names
+        return {
+            "items": {names[item_id]: count for item_id, count in self.carried.items()},
+            "equipped": {names[item_id]: count for item_id, count in self.equipped.items()},
+        }
+
+    # --- Queries ---
+
+    def count(self, item, equipped=None):
+        """Units of an item. equipped=None counts carried and equipped together."""
+        item_id = _find(item)
+        if equipped is None:
+            return self.carried.get(item_id, 0) + self.equipped.get(item_id, 0)
+        stacks = self.equipped if equipped else self.carried
+        return stacks.get(item_id, 0)
+
+    def is_equipped(self, item):
+        return self.count(item, equipped=True) > 0
+
+    def name_of(self, item):
+        item_id = _find(item)
+        return ITEM_REGISTRY.names[item_id] if item_id is not None else normalize_item_name(item)
+
+    def carried_items(self):
+        """(display name, count) for every carried stack."""
+        names = ITEM_REGISTRY.names
+        return [(names[item_id], count) for item_id, count in self.carried.items()]
+
+    def equipped_items(self):
+        """(display name, count) for every equipped stack."""
+        names = ITEM_REGISTRY.names
+        return [(names[item_id], count) for item_id, count in self.equipped.items()]
+
+    def __len__(self):
+        return sum(self.carried.values()) + sum(self.equipped.values())
+
+    def __bool__(self):
+        return bool(self.carried) or bool(self.equipped)
+
+    def __eq__(self, other):
+        if not isinstance(other, Stash):
+            return NotImplemented
+        return self.carried == other.carried and self.equipped == other.equipped
+
+    def __repr__(self):
+        return f"Stash({self.to_data()!r})"
+
+    def track(self):
+        """Start maintaining a StashSummary (if not already) and return it."""
+        if self.summary is None:
+            self.summary = StashSummary.of(self)
+        return self.summary
+
+    # --- Mutations ---
+
+    def add(self, item, amount=1, equipped=False):
+        if amount <= 0:
+            return
+        if type(item) is int:
+            item_id = item
+        else:
+            if item.startswith("E:"):
+                equipped = True
+            item_id = ITEM_REGISTRY.register(item)
+
+        stacks = self.equipped if equipped else self.carried
+        stacks[item_id] = stacks.get(item_id, 0) + amount
+        if equipped:
+            self.equip_version += 1
+        if self.summary is not None:
+            self.summary.update(item_id, amount)
+
+    def _decrement(self, stacks, item_id, amount):
+        if stacks is self.equipped:
+            self.equip_version += 1
+        if self.summary is not None:
+            self.summary.update(item_id, -amount)
+        remaining = stacks[item_id] - amount
+        if remaining > 0:
+            stacks[item_id] = remaining
+        else:
+            del stacks[item_id]
+
+    def take(self, item, amount=1):
+        """
+        Remove `amount` units, carried ones first, then equipped ones.
+
+        Returns:
+            (item_id, carried_taken, equipped_taken), or None if there
+            aren't enough units.
+        """
+        item_id = _find(item)
+        carried = self.carried.get(item_id, 0)
+        equipped = self.equipped.get(item_id, 0)
+        if carried + equipped < amount or amount <= 0:
+            return None
+
+        from_carried = min(carried, amount)
+        from_equipped = amount - from_carried
+        if from_carried:
+            self._decrement(self.carried, item_id, from_carried)
+        if from_equipped:
+            self._decrement(self.equipped, item_id, from_equipped)
+        return item_id, from_carried, from_equipped
+
+    def equip(self, item):
+        """Move one carried unit to the equipped slots. Returns True on success."""
+        item_id = _find(item)
+        if not self.carried.get(item_id):
+            return False
+        self._decrement(self.carried, item_id, 1)
+        self.add(item_id, 1, equipped=True)
+        return True
+
+    def unequip(self, item):
+        """Move one equipped unit back to carried. Returns True on success."""
+        item_id = _find(item)
+        if not self.equipped.get(item_id):
+            return False
+        self._decrement(self.equipped, item_id, 1)
+        self.add(item_id, 1)
+        return True
+
+
+def to_json(obj):
+    """`default=` hook for json.dump so Stash objects serialize transparently."""
+    if isinstance(obj, Stash):
+        return obj.to_data()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def upgrade_inventory(entity):
+    """Replace an entity's saved inventory (old list or new dict) with a Stash."""
+    entity["inventory"] = Stash.from_data(entity.get("inventory", []))
+    return entity
+
 
 def transfer_item(characters, source_id, target_id, item, amount=1, base=None):
     """
     Transfer items between characters and/or base inventory.
 
+    Non-equipped units are moved first; equipped units keep their slot.
+
     Returns:
         (success: bool, transferred_count: int, item_name: str)
     """
     print(f"🔁 Transferring {item} x{amount} from {source_id} to {target_id}")
 
-    item = normalize_item_name(item)
+    item_id = ITEM_REGISTRY.find(item)
+    item = ITEM_REGISTRY.keys[item_id] if item_id is not None else normalize_item_name(item)
 
     def get_inventory(entity_id):
         if entity_id == "base":
@@ -29,33 +275,15 @@ def transfer_item(characters, source_id, target_id, item, amount=1, base=None):
         print(f"❌ {e}")
         return False, 0, item
 
-    # --- Handle stackable resources ---
-    if item in ABSTRACT_RESOURCES:
-        matches = [i for i in source_inv if normalize_item_name(i) == item]
-        if len(matches) < amount:
-            print(f"❌ Not enough '{item}'. Needed {amount}, found {len(matches)}")
-            return False, len(matches), item
-
-        for i in matches[:amount]:
-            source_inv.remove(i)
-            target_inv.append(i)
-        return True, amount, item
-
-    # --- Handle single items (non-stackable) ---
-    # Prioritize non-equipped versions (do not start with "E:")
-    non_equipped_matches = [i for i in source_inv if normalize_item_name(i) == item and not i.startswith("E:")]
-    equipped_matches = [i for i in source_inv if normalize_item_name(i) == item and i.startswith("E:")]
-
-    all_matches = non_equipped_matches + equipped_matches
-
-    if len(all_matches) < amount:
-        print(f"❌ Not enough '{item}' to transfer. Needed {amount}, found {len(all_matches)}")
-        return False, len(all_matches), item
-
-    for i in all_matches[:amount]:
-        source_inv.remove(i)
-        target_inv.append(i)
+    taken = source_inv.take(item_id, amount)
+    if taken is None:
+        found = source_inv.count(item_id)
+        print(f"❌ Not enough '{item}' to transfer. Needed {amount}, found {found}")
+        return False, found, item
 
+    _, from_carried, from_equipped = taken
+    target_inv.add(item_id, from_carried)
+    target_inv.add(item_id, from_equipped, equipped=True)
     return True, amount, item
 
 def remove_item(entity, item, amount=1):
@@ -63,39 +291,22 @@ def remove_item(entity, item, amount=1):
     Removes a specific number of items from an inventory.
 
     Args:
-        entity: dict containing an 'inventory' list (character or base)
+        entity: dict containing an 'inventory' Stash (character or base)
         item: name of item to remove (case-insensitive, normalized)
         amount: number of items to remove
 
     Returns:
         (success: bool, removed_count: int, item_name: str)
     """
-    item = normalize_item_name(item)
-    inventory = entity.get("inventory", [])
+    item_id = ITEM_REGISTRY.find(item)
+    item = ITEM_REGISTRY.keys[item_id] if item_id is not None else normalize_item_name(item)
+    inventory = entity.get("inventory") or Stash()
 
     print(f"🗑️ Removing {amount}x '{item}' from inventory.")
 
-    if item in ABSTRACT_RESOURCES:
-        matches = [i for i in inventory if normalize_item_name(i) == item]
-        if len(matches) < amount:
-            print(f"❌ Not enough '{item}' to remove. Needed {amount}, found {len(matches)}")
-            return False, len(matches), item
-
-        for i in matches[:amount]:
-            inventory.remove(i)
-        return True, amount, item
-
-    # Handle non-stackable items
-    non_equipped = [i for i in inventory if normalize_item_name(i) == item and not i.startswith("E:")]
-    equipped = [i for i in inventory if normalize_item_name(i) == item and i.startswith("E:")]
-
-    all_matches = non_equipped + equipped
-
-    if len(all_matches) < amount:
-        print(f"❌ Not enough '{item}' to remove. Needed {amount}, found {len(all_matches)}")
-        return False, len(all_matches), item
-
-    for i in all_matches[:amount]:
-        inventory.remove(i)
+    if inventory.take(item_id, amount) is None:
+        found = inventory.count(item_id)
+        print(f"❌ Not enough '{item}' to remove. Needed {amount}, found {found}")
+        return False, found, item
 
     return True, amount, item
@@ -2,15 +2,62 @@
 
 import json
 import os
+import tempfile
+
+from utils.inventory import to_json
 
 CHARACTER_DATA_PATH = "data/characters.json"
 
-def load_characters():
-    if not os.path.exists(CHARACTER_DATA_PATH):
+def load_characters(path=CHARACTER_DATA_PATH):
+    if not os.path.exists(path):
         return {}
-    with open(CHARACTER_DATA_PATH, "r") as f:
+    with open(path, "r") as f:
         return json.load(f)
 
-def save_characters(data):
-    with open(CHARACTER_DATA_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+def write_json_atomic(path, data):
+    """Write JSON to a temp file in the same directory, then rename it over `path`."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, default=to_json)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def save_characters(data, path=CHARACTER_DATA_PATH):
+    write_json_atomic(path, data)
+
+def entry_fragment(value):
+    """
+    A value serialized for write_fragments_atomic: one compact line, which
+    goes through json's C encoder (indent= would force the Python one).
+    """
+    return json.dumps(value, default=to_json)
+
+def write_fragments_atomic(path, fragments):
+    """
+    Like write_json_atomic for a {key: entry_fragment} dict whose values are
+    already serialized. Each entry goes on its own line.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            if fragments:
+                f.write("{\n")
+                f.write(",\n".join(f"  {json.dumps(key)}: {fragment}" for key, fragment in fragments.items()))
+                f.write("\n}")
+            else:
+                f.write("{}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
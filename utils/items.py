@@ -1,11 +1,83 @@
 # utils/items.py
 
 import random
+import sys
+from types import MappingProxyType
+
+try:
+    import numpy as np
+except ImportError:  # roll_loot falls back to the pure-Python sampler
+    np = None
 
 def normalize_item_name(item: str) -> str:
     return item[2:].lower() if item.startswith("E:") else item.lower()
 
 
+RESOURCE_CATEGORY = "resource"  # abstract resources (see ABSTRACT_RESOURCES)
+DEFAULT_CATEGORY = "gear"       # anything not listed in ITEMS
+
+class ItemRegistry:
+    """
+    Canonical, interned ids for item names.
+
+    Every spelling of an item ("Crowbar", "crowbar", "E:Crowbar") resolves to
+    one small int id, and the registry keeps that item's normalized key,
+    display name and category ("resource", an ITEMS type, or "gear").
+    Inventories store ids, so the hot paths compare ints and never rebuild
+    lowercase strings; the spelling -> id lookup is memoized.
+
+    Resources, ITEMS and background gear are registered at import, loot names
+    when the loot table is compiled. Anything else gets an id the first time
+    it's added to an inventory; lookups through find() never register.
+    """
+
+    MAX_SPELLINGS = 4096  # memoized raw spellings before the memo is reset
+
+    def __init__(self):
+        self.keys = []        # id -> normalized key (interned)
+        self.names = []       # id -> display name
+        self.categories = []  # id -> category
+        self._by_key = {}     # normalized key -> id
+        self._spellings = {}  # name exactly as given -> id
+
+    def __len__(self):
+        return len(self.keys)
+
+    def register(self, name, display=None, category=DEFAULT_CATEGORY):
+        """Id for `name`, assigning a new one if the item is unknown."""
+        item_id = self.find(name)
+        if item_id is not None:
+            return item_id
+
+        key = sys.intern(normalize_item_name(name))
+        if display is None:
+            display = name[2:] if name.startswith("E:") else name
+        item_id = len(self.keys)
+        self.keys.append(key)
+        self.names.append(display)
+        self.categories.append(category)
+        self._by_key[key] = item_id
+        self._remember(name, item_id)
+        return item_id
+
+    def find(self, name):
+        """Id for `name`, or None if no such item was ever registered."""
+        item_id = self._spellings.get(name)
+        if item_id is None:
+            item_id = self._by_key.get(normalize_item_name(name))
+            if item_id is not None:
+                self._remember(name, item_id)
+        return item_id
+
+    def _remember(self, name, item_id):
+        if len(self._spellings) >= self.MAX_SPELLINGS:
+            self._spellings.clear()
+        self._spellings[name] = item_id
+
+
+ITEM_REGISTRY = ItemRegistry()
+
+
 ABSTRACT_RESOURCES = {
     "materials": "🧱 Materials",
     "food": "🍖 Food",
@@ -48,7 +120,67 @@ ITEMS = {
     # You can add more items with "durability", "uses", etc.
 }
 
-LOOT_TABLE = {
+# Abstract resources display by their key, matching how they're stored
+for _key in ABSTRACT_RESOURCES:
+    ITEM_REGISTRY.register(_key, display=_key, category=RESOURCE_CATEGORY)
+for _name, _data in ITEMS.items():
+    ITEM_REGISTRY.register(_name, category=_data.get("type", DEFAULT_CATEGORY))
+
+class LootTable(dict):
+    """
+    LOOT_TABLE: {rarity: {"weight": w, "items": [{"name": ..., "amount": (lo, hi)}]}}.
+
+    Rarity entries are frozen as they're stored (read-only mappings, item
+    tuples), so the only way to change the odds is to assign or delete a
+    whole rarity. Each of those bumps `version`, which roll_loot compares
+    with the compiled samplers' to recompile after a change - one int
+    comparison per roll instead of rehashing the table.
+    """
+
+    def __init__(self, entries=()):
+        super().__init__()
+        self.version = 0
+        self.update(entries)
+
+    @staticmethod
+    def _freeze(entry):
+        items = tuple(MappingProxyType(dict(item)) for item in entry["items"])
+        return MappingProxyType({**entry, "items": items})
+
+    def __setitem__(self, rarity, entry):
+        super().__setitem__(rarity, self._freeze(entry))
+        self.version += 1
+
+    def __delitem__(self, rarity):
+        super().__delitem__(rarity)
+        self.version += 1
+
+    def update(self, entries=(), **more):
+        for rarity, entry in dict(entries, **more).items():
+            self[rarity] = entry
+
+    def __ior__(self, entries):
+        self.update(entries)
+        return self
+
+    def pop(self, rarity, *default):
+        self.version += 1
+        return super().pop(rarity, *default)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+    def setdefault(self, rarity, entry=None):
+        if rarity not in self:
+            self[rarity] = entry
+        return self[rarity]
+
+LOOT_TABLE = LootTable({
     "common": {
         "weight": 60,
         "items": [
@@ -81,28 +213,120 @@ LOOT_TABLE = {
             {"name": "Medical Kit"},
         ]
     }
-}
+})
+
+# Draws above this size use NumPy (when installed) instead of a Python loop.
+NUMPY_LOOT_THRESHOLD = 256
+
+
+class AliasSampler:
+    """
+    Walker/Vose alias table: O(n) to build, O(1) per draw.
+
+    outcomes: list of values, weights: matching non-negative weights.
+    """
+
+    def __init__(self, outcomes, weights):
+        count = len(outcomes)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("AliasSampler needs at least one outcome with positive weight.")
+
+        self.outcomes = list(outcomes)
+        self.prob = [0.0] * count
+        self.alias = [0] * count
+
+        scaled = [w * count / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample_indices(self, k, rng=random):
+        count = len(self.prob)
+        prob, alias = self.prob, self.alias
+        draws = []
+        for _ in range(k):
+            i = int(rng.random() * count)
+            draws.append(i if rng.random() < prob[i] else alias[i])
+        return draws
+
+    def sample_indices_numpy(self, k, np_rng):
+        column = np_rng.integers(0, len(self.prob), size=k)
+        keep = np_rng.random(k) < np.asarray(self.prob)[column]
+        return np.where(keep, column, np.asarray(self.alias)[column])
+
+
+_compiled_loot = None  # (LOOT_TABLE.version, rarity sampler, outcome sampler, amount ranges)
+
+def compile_loot_table():
+    """
+    Compile LOOT_TABLE into alias samplers.
+
+    Every (rarity, item) pair becomes one outcome weighted by
+    rarity weight / items in that rarity, so a single draw picks both.
+    roll_loot compiles on first use and again after LOOT_TABLE changes.
+    """
+    global _compiled_loot
+
+    version = LOOT_TABLE.version
+    rarities = list(LOOT_TABLE)
+    rarity_sampler = AliasSampler(rarities, [LOOT_TABLE[r]["weight"] for r in rarities])
+
+    outcomes, weights, ranges = [], [], []
+    for rarity in rarities:
+        items = LOOT_TABLE[rarity]["items"]
+        for item in items:
+            ITEM_REGISTRY.register(item["name"])
+            outcomes.append(item["name"])
+            weights.append(LOOT_TABLE[rarity]["weight"] / len(items))
+            ranges.append(tuple(item.get("amount", (1, 1))))
+
+    _compiled_loot = (version, rarity_sampler, AliasSampler(outcomes, weights), ranges)
+    return _compiled_loot
+
+def _loot_sampler():
+    if _compiled_loot is None or _compiled_loot[0] != LOOT_TABLE.version:
+        return compile_loot_table()
+    return _compiled_loot
 
 def choose_rarity():
-    rarities = list(LOOT_TABLE.keys())
-    weights = [LOOT_TABLE[r]["weight"] for r in rarities]
-    return random.choices(rarities, weights=weights, k=1)[0]
-    
-def roll_loot(successes: int):
-    loot_results = []
+    _, rarity_sampler, _, _ = _loot_sampler()
+    return rarity_sampler.outcomes[rarity_sampler.sample_indices(1)[0]]
 
-    for _ in range(successes):
-        rarity = choose_rarity()
-        item_entry = random.choice(LOOT_TABLE[rarity]["items"])
-        name = item_entry["name"]
+def roll_loot(successes: int, np_rng=None):
+    """
+    Roll `successes` loot draws in one batch.
 
-        if "amount" in item_entry:
-            min_amt, max_amt = item_entry["amount"]
-            amount = random.randint(min_amt, max_amt)
-            loot_results.append((name, amount))
-        else:
-            loot_results.append((name, 1))  # One of a non-stackable item
+    Returns a list of (item name, amount). Large batches use NumPy when it is
+    installed; pass np_rng (a numpy Generator) to make them reproducible.
+    """
+    if successes <= 0:
+        return []
 
+    _, _, sampler, ranges = _loot_sampler()
+
+    if np is not None and (np_rng is not None or successes >= NUMPY_LOOT_THRESHOLD):
+        np_rng = np_rng or np.random.default_rng()
+        picks = sampler.sample_indices_numpy(successes, np_rng)
+        bounds = np.asarray(ranges)[picks]
+        amounts = np_rng.integers(bounds[:, 0], bounds[:, 1] + 1)
+        names = sampler.outcomes
+        return [(names[i], a) for i, a in zip(picks.tolist(), amounts.tolist())]
+
+    loot_results = []
+    for i in sampler.sample_indices(successes):
+        min_amt, max_amt = ranges[i]
+        amount = random.randint(min_amt, max_amt) if max_amt > min_amt else min_amt
+        loot_results.append((sampler.outcomes[i], amount))
     return loot_results
 
 def format_loot(loot):
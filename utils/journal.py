@@ -0,0 +1,283 @@
+# utils/journal.py
+
+import json
+import os
+
+from utils.base import BASE_PATH, save_base
+from utils.hunger_thirst import tick_all, upgrade_last_tick
+from utils.inventory import Stash, upgrade_inventory
+from utils.io import CHARACTER_DATA_PATH, entry_fragment, write_fragments_atomic, write_json_atomic
+from utils.storage import JsonStorage, snapshot_entity
+from utils.timings import IO_TIMINGS
+
+JOURNAL_PATH = "data/journal.jsonl"
+COMPACT_EVERY = 5_000  # journal records between snapshot compactions
+
+# --- Typed events ---
+#
+# Each event is a small JSON-ready dict appended to the journal as one line.
+# Replaying them in order on top of the last snapshot reproduces the live
+# state, so they describe what happened (item, amount, owner) rather than
+# copying whole characters.
+
+def character_created(user_id, character):
+    return {"type": "character_created", "id": user_id, "character": snapshot_entity(character)}
+
+def character_killed(user_id):
+    return {"type": "character_killed", "id": user_id}
+
+def item_transferred(source_id, target_id, item, amount):
+    return {"type": "item_transferred", "source": source_id, "target": target_id, "item": item, "amount": amount}
+
+def item_removed(owner_id, item, amount):
+    return {"type": "item_removed", "owner": owner_id, "item": item, "amount": amount}
+
+def loot_granted(owner_id, items):
+    """items: (item, amount) pairs or an {item: amount} dict."""
+    if isinstance(items, dict):
+        items = items.items()
+    return {"type": "loot_granted", "owner": owner_id, "items": [[item, amt] for item, amt in items]}
+
+def hunger_ticked(now):
+    return {"type": "hunger_ticked", "now": now}
+
+# Changes without a typed event are journaled as the entity's new state.
+
+def entity_put(entity_id, entity):
+    return {"type": "put", "id": entity_id, "data": snapshot_entity(entity) if entity is not None else None}
+
+def inventory_put(owner_id, inventory):
+    return {"type": "inventory_put", "id": owner_id, "items": Stash.from_data(inventory).to_data()}
+
+
+def _load_entity(data):
+    upgrade_inventory(data)
+    upgrade_last_tick(data)
+    return data
+
+def _owner(characters, base, owner_id):
+    return base if owner_id == "base" else characters.get(owner_id)
+
+def apply_record(characters, base, record):
+    """Replay one journal record onto loaded state. Returns the (possibly replaced) base."""
+    kind = record["type"]
+
+    if kind == "character_created":
+        characters[record["id"]] = _load_entity(record["character"])
+    elif kind == "character_killed":
+        characters.pop(record["id"], None)
+    elif kind == "item_transferred":
+        # Same moves as transfer_item, without its per-call logging
+        source = _owner(characters, base, record["source"])
+        target = _owner(characters, base, record["target"])
+        if source is not None and target is not None:
+            taken = source["inventory"].take(record["item"], record["amount"])
+            if taken is not None:
+                item_id, from_carried, from_equipped = taken
+                target["inventory"].add(item_id, from_carried)
+                target["inventory"].add(item_id, from_equipped, equipped=True)
+    elif kind == "item_removed":
+        owner = _owner(characters, base, record["owner"])
+        if owner is not None:
+            owner["inventory"].take(record["item"], record["amount"])
+    elif kind == "loot_granted":
+        owner = _owner(characters, base, record["owner"])
+        if owner is not None:
+            for item, amt in record["items"]:
+                owner["inventory"].add(item, amt)
+    elif kind == "hunger_ticked":
+        tick_all(characters, record["now"])
+    elif kind == "put":
+        if record["id"] == "base":
+            base = upgrade_inventory(record["data"])
+        elif record["data"] is None:
+            characters.pop(record["id"], None)
+        else:
+            characters[record["id"]] = _load_entity(record["data"])
+    elif kind == "inventory_put":
+        owner = _owner(characters, base, record["id"])
+        if owner is not None:
+            owner["inventory"] = Stash.from_data(record["items"])
+    else:
+        raise ValueError(f"Unknown journal record type '{kind}'")
+    return base
+
+
+class JournalStorage:
+    """
+    Append-only journal on top of a JSON snapshot.
+
+    The repository hands over journal records (typed events and puts) in the
+    order changes happened, and each flush appends them to journal.jsonl as
+    one line per record - the cost follows the size of the change, and a
+    crash can at worst cut off the last, partly written line.
+
+    Every COMPACT_EVERY records the I/O thread folds the journal into a new
+    snapshot: it loads the previous snapshot, replays the journal onto it and
+    writes the result to characters.json/base.json before emptying the
+    journal. The event loop only numbers records, never copies the camp.
+    Startup loads the snapshot and replays the journal records newer than it.
+    Existing characters.json/base.json files load as a snapshot with an empty
+    journal, so switching backends needs no migration.
+
+    The two snapshot files can't be replaced in one rename, so a compaction
+    stages both next to the live ones and then writes a marker: the marker is
+    the commit point. A crash before it leaves the old snapshot and journal
+    untouched; a crash after it is rolled forward on the next startup. Either
+    way the snapshot and its journal_seq describe the same records.
+    """
+
+    journaled = True
+
+    def __init__(self, characters_path=CHARACTER_DATA_PATH, base_path=BASE_PATH,
+                 journal_path=JOURNAL_PATH, compact_every=COMPACT_EVERY):
+        self.snapshots = JsonStorage(characters_path, base_path, cache_fragments=False)
+        self.journal_path = journal_path
+        self.marker_path = journal_path + ".compact"
+        self.staged = {
+            characters_path: characters_path + ".compact",
+            base_path: base_path + ".compact",
+        }
+        self.compact_every = compact_every
+        self.seq = 0                 # last sequence number handed out
+        self.since_compaction = 0    # records appended since the last snapshot
+
+    def load(self):
+        self._recover_compaction()
+        characters, base, snapshot_seq = self._load_snapshot()
+        with IO_TIMINGS.time("replay"):
+            base, replayed, self.seq = self._replay(characters, base, snapshot_seq)
+        self.since_compaction = replayed
+        if replayed:
+            print(f"📜 Replayed {replayed} journal record(s) on top of the snapshot.")
+        return characters, base
+
+    def _load_snapshot(self):
+        characters, base = self.snapshots.load()
+        return characters, base, base.pop("journal_seq", 0)
+
+    def _replay(self, characters, base, snapshot_seq, until=None):
+        """
+        Apply the journal records newer than snapshot_seq (up to `until`).
+
+        Returns:
+            (base, records applied, seq of the last record applied)
+        """
+        replayed = 0
+        last_seq = snapshot_seq
+        for record in self._read_journal():
+            if record["seq"] <= snapshot_seq:
+                continue  # already folded into the snapshot
+            if until is not None and record["seq"] > until:
+                break
+            base = apply_record(characters, base, record)
+            last_seq = record["seq"]
+            replayed += 1
+        return base, replayed, last_seq
+
+    def _read_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        good_bytes = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                good_bytes += len(line)
+                yield record
+
+        if good_bytes != os.path.getsize(self.journal_path):
+            print("⚠️ Journal ends with a partial record (interrupted write); dropping it.")
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_bytes)
+
+    def save(self, characters, base, character_ids=(), inventory_ids=(), records=()):
+        self.write(self.snapshot(characters, base, character_ids, inventory_ids, records))
+
+    def snapshot(self, characters, base, character_ids=(), inventory_ids=(), records=()):
+        """
+        Number the pending records and decide whether this flush compacts.
+
+        Dirty ids are only used for whole-state saves (e.g. migrations); the
+        repository journals each change as it happens.
+        """
+        records = list(records)
+        records += [entity_put(entity_id, _owner(characters, base, entity_id)) for entity_id in character_ids]
+        records += [inventory_put(owner_id, _owner(characters, base, owner_id)["inventory"])
+                    for owner_id in inventory_ids if _owner(characters, base, owner_id) is not None]
+
+        for record in records:
+            self.seq += 1
+            record["seq"] = self.seq
+        self.since_compaction += len(records)
+
+        compact_at = None
+        if self.since_compaction >= self.compact_every:
+            compact_at = self.seq
+            self.since_compaction = 0
+        return {"records": records, "compact_at": compact_at}
+
+    def write(self, snapshot):
+        """Append records, then fold the journal into a new snapshot if one is due."""
+        records = snapshot["records"]
+        if records:
+            with IO_TIMINGS.time("journal_append"):
+                data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        if snapshot["compact_at"] is not None:
+            # The records are durable by now: a failed compaction must not fail
+            # the flush, or the repository would journal them a second time.
+            try:
+                with IO_TIMINGS.time("compact"):
+                    self._compact(snapshot["compact_at"])
+            except Exception as e:
+                print(f"❌ Journal compaction failed, keeping the journal: {e}")
+            else:
+                print(f"🗜️ Compacted journal into a snapshot at record {snapshot['compact_at']}.")
+
+    def _compact(self, seq):
+        """Replay the journal onto the last snapshot and commit the result as the new one."""
+        # Writes are serialized on one thread, so every record up to seq is
+        # already in the journal and nothing after it is.
+        self._recover_compaction()
+        characters, base, snapshot_seq = self._load_snapshot()
+        base, _, _ = self._replay(characters, base, snapshot_seq, until=seq)
+        base = snapshot_entity(base)
+        base["journal_seq"] = seq
+
+        write_fragments_atomic(self.staged[self.snapshots.characters_path],
+                               {char_id: entry_fragment(char) for char_id, char in characters.items()})
+        save_base(base, self.staged[self.snapshots.base_path])
+        write_json_atomic(self.marker_path, {"journal_seq": seq})
+        self._finish_compaction()
+
+    def _finish_compaction(self):
+        """Move committed staged files into place and empty the journal they cover."""
+        for path, staged_path in self.staged.items():
+            if os.path.exists(staged_path):
+                os.replace(staged_path, path)
+        with open(self.journal_path, "w"):
+            pass
+        os.remove(self.marker_path)
+
+    def _recover_compaction(self):
+        """Finish a compaction that reached its marker, or drop one that didn't."""
+        if os.path.exists(self.marker_path):
+            print("🔧 Finishing a compaction interrupted after its commit point.")
+            self._finish_compaction()
+            return
+        for staged_path in self.staged.values():
+            if os.path.exists(staged_path):
+                print(f"🧹 Removing {staged_path} left by an interrupted compaction.")
+                os.remove(staged_path)
+
+    def close(self):
+        pass
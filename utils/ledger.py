@@ -0,0 +1,57 @@
+# utils/ledger.py
+
+import time
+
+GAME_DAY_SECONDS = 24 * 60 * 60
+
+
+class DailyLedger:
+    """
+    Who has used their daily action, keyed by game day.
+
+    The base holds the current day number and when it started; each character
+    stores the day of its last action in "last_action_day". A character has
+    acted today iff that equals the current day, so rolling over to a new day is
+    just bumping the base's counter - no per-character entries are cleared.
+
+    Rollover happens lazily on the first lookup past the day boundary, and
+    catches up over any downtime in one step. Everything lives on the
+    character and base dicts, so it is persisted by the normal repository
+    flush.
+    """
+
+    def __init__(self, repo, day_length=GAME_DAY_SECONDS, clock=time.time):
+        self.repo = repo
+        self.day_length = day_length
+        self.clock = clock
+
+        base = repo.base
+        if "day" not in base:
+            now = int(self.clock())
+            base["day"] = 1
+            base["day_started"] = now - now % self.day_length  # align to UTC midnight
+            repo.mark_dirty("base")
+
+    def today(self):
+        """The current game day, rolling over if the day has ended."""
+        base = self.repo.base
+        elapsed = int(self.clock()) - base["day_started"]
+        if elapsed >= self.day_length:
+            days = elapsed // self.day_length
+            base["day"] += days
+            base["day_started"] += days * self.day_length
+            self.repo.mark_dirty("base")
+            print(f"🌅 Day {base['day']} has begun.")
+        return base["day"]
+
+    def has_acted(self, user_id):
+        char = self.repo.get(user_id)
+        return char is not None and char.get("last_action_day") == self.today()
+
+    def record(self, user_id):
+        """Mark a character's daily action as used for today."""
+        char = self.repo.get(user_id)
+        if char is None:
+            return
+        char["last_action_day"] = self.today()
+        self.repo.mark_dirty(user_id)
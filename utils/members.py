@@ -0,0 +1,71 @@
+# utils/members.py
+
+import asyncio
+from collections import OrderedDict
+
+MAX_CONCURRENT_FETCHES = 5
+USER_CACHE_SIZE = 256
+
+
+class MemberResolver:
+    """
+    Turns user ids into User objects with as few REST calls as possible.
+
+    Lookups go to a small LRU of recently resolved users first, then the
+    client's own cache (bot.get_user), and only the remaining misses are
+    fetched - concurrently, at most max_concurrency at a time. Launching a
+    group action therefore costs about one round trip no matter how many
+    members it has.
+    """
+
+    def __init__(self, bot, max_concurrency=MAX_CONCURRENT_FETCHES, cache_size=USER_CACHE_SIZE):
+        self.bot = bot
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # user id -> User, least recently used first
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def remember(self, user):
+        self._cache[user.id] = user
+        self._cache.move_to_end(user.id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def cached(self, user_id):
+        user = self._cache.get(user_id)
+        if user is not None:
+            self._cache.move_to_end(user_id)
+            return user
+        return self.bot.get_user(user_id)
+
+    async def _fetch(self, user_id):
+        async with self._semaphore:
+            return await self.bot.fetch_user(user_id)
+
+    async def resolve(self, user_ids):
+        """
+        Resolve many ids at once.
+
+        Returns:
+            {user_id: User} for every id that could be resolved. Ids that fail
+            to fetch are left out.
+        """
+        users = {}
+        misses = []
+        for user_id in user_ids:
+            user = self.cached(user_id)
+            if user is None:
+                misses.append(user_id)
+            else:
+                users[user_id] = user
+
+        if misses:
+            results = await asyncio.gather(*(self._fetch(user_id) for user_id in misses), return_exceptions=True)
+            for user_id, result in zip(misses, results):
+                if isinstance(result, Exception):
+                    print(f"❌ Failed to fetch user {user_id}: {result}")
+                    continue
+                users[user_id] = result
+
+        for user in users.values():
+            self.remember(user)
+        return users
@@ -0,0 +1,62 @@
+# utils/reactions.py
+
+import discord
+
+class ReactionRouter:
+    """
+    One raw-reaction listener for the whole bot.
+
+    Cogs register the messages they care about with a handler, and every
+    reaction is routed with a single dict lookup on its message id. Reactions
+    on unregistered messages are dropped before anything else happens.
+
+    Built on on_raw_reaction_add, so it works whether or not the message is in
+    discord.py's message cache. Handlers keep their own Message object (from
+    original_response() or channel.send()) for edits and reaction removal.
+
+    Handlers are called as handler(payload, emoji, user), where emoji is the
+    reaction as a string and user is the member/user who reacted. Reactions
+    from bots (including our own add_reaction calls) are ignored.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers = {}  # message id -> handler
+
+    def register(self, message_id, handler):
+        self.handlers[message_id] = handler
+
+    def unregister(self, message_id):
+        return self.handlers.pop(message_id, None)
+
+    def __contains__(self, message_id):
+        return message_id in self.handlers
+
+    def __len__(self):
+        return len(self.handlers)
+
+    async def resolve_user(self, payload):
+        """The reacting member (guilds), or a cached/fetched user (DMs)."""
+        if payload.member is not None:
+            return payload.member
+        return self.bot.get_user(payload.user_id) or await self.bot.fetch_user(payload.user_id)
+
+    async def on_raw_reaction_add(self, payload):
+        handler = self.handlers.get(payload.message_id)
+        if handler is None:
+            return
+        if self.bot.user is not None and payload.user_id == self.bot.user.id:
+            return
+
+        try:
+            user = await self.resolve_user(payload)
+        except discord.HTTPException as e:
+            print(f"❌ Couldn't resolve reacting user {payload.user_id} on message {payload.message_id}: {e}")
+            return
+        if user.bot:
+            return
+
+        try:
+            await handler(payload, str(payload.emoji), user)
+        except Exception as e:
+            print(f"❌ Reaction handler failed for message {payload.message_id}: {e}")
@@ -0,0 +1,71 @@
+# utils/render.py
+
+import asyncio
+
+RENDER_WINDOW = 0.4  # seconds to wait for more changes before editing
+
+
+class RenderScheduler:
+    """
+    Coalesces embed edits per message.
+
+    Each state change calls request(message, render). Changes arriving within
+    RENDER_WINDOW of each other collapse into one message.edit, built from the
+    latest state when the edit actually goes out. A single task per message
+    sends edits in order, and anything requested while an edit is in flight
+    is rendered afterwards, so the final state always reaches Discord.
+    """
+
+    def __init__(self, window=RENDER_WINDOW):
+        self.window = window
+        self._pending = {}  # message id -> (message, render)
+        self._tasks = {}    # message id -> asyncio.Task
+        self._stats = {}    # message id -> {"requests": int, "edits": int}
+
+    def request(self, message, render):
+        """Schedule an edit of `message` with the embed returned by render()."""
+        message_id = message.id
+        self._pending[message_id] = (message, render)
+        stats = self._stats.setdefault(message_id, {"requests": 0, "edits": 0})
+        stats["requests"] += 1
+
+        if message_id not in self._tasks:
+            self._tasks[message_id] = asyncio.create_task(self._run(message_id))
+
+    async def _run(self, message_id):
+        try:
+            while message_id in self._pending:
+                await asyncio.sleep(self.window)
+                message, render = self._pending.pop(message_id)
+                try:
+                    await message.edit(embed=render())
+                    self._stats[message_id]["edits"] += 1
+                except Exception as e:
+                    print(f"❌ Failed to update embed for message {message_id}: {e}")
+        finally:
+            self._tasks.pop(message_id, None)
+
+    async def finish(self, message_id):
+        """
+        Wait for any pending edit of a message, then stop tracking it.
+
+        Returns the session's stats, including how many API calls were saved
+        compared to a fetch_message + edit per change.
+        """
+        task = self._tasks.get(message_id)
+        if task is not None:
+            await task
+        stats = self._stats.pop(message_id, {"requests": 0, "edits": 0})
+        stats["saved"] = stats["requests"] * 2 - stats["edits"]
+        if stats["requests"]:
+            print(f"📉 Message {message_id}: {stats['requests']} change(s), {stats['edits']} edit(s), "
+                  f"{stats['saved']} API call(s) saved.")
+        return stats
+
+    def cancel(self, message_id):
+        """Drop a message's pending edits without sending them."""
+        self._pending.pop(message_id, None)
+        task = self._tasks.pop(message_id, None)
+        if task is not None:
+            task.cancel()
+        return self._stats.pop(message_id, None)
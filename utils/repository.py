@@ -0,0 +1,238 @@
+# utils/repository.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from utils.camp import CampIndex
+from utils.journal import character_created, character_killed, entity_put, inventory_put
+from utils.ledger import DailyLedger
+from utils.skills import SkillIndex
+from utils.storage import JsonStorage
+from utils.timings import IO_TIMINGS
+
+DEFAULT_FLUSH_INTERVAL = 30  # seconds
+
+class CharacterRepository:
+    """
+    Long-lived, in-memory view of all game state owned by the bot.
+
+    Characters and the base are loaded once at startup and served from memory.
+    Commands mark the entities they changed as dirty, and the repository writes
+    them back on a fixed interval and once more at shutdown through the
+    configured storage backend (see utils/storage.py). Everything passed to
+    the mark_* methods and record() also refreshes the camp-wide totals
+    (utils/camp.py).
+
+    On the event loop a flush only snapshots the dirty entities; serialization
+    and disk writes run on a dedicated single-thread executor.
+
+    With a journaled backend (utils/journal.py) nothing is tracked as dirty:
+    record() and the mark_* methods append journal records in the order the
+    changes happen, and a flush hands the pending records to the backend.
+    """
+
+    def __init__(self, storage=None, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.storage = storage or JsonStorage()
+        self.flush_interval = flush_interval
+        self.characters, self.base = self.storage.load()
+        self.base["inventory"].track()  # live totals for /storage
+        self._dirty = set()
+        self._dirty_inventories = set()
+        self._journal = [] if getattr(self.storage, "journaled", False) else None
+        self._locks = {}  # entity id -> asyncio.Lock
+        self.skills = SkillIndex(self)
+        self.camp = CampIndex(self)
+        self.ledger = DailyLedger(self)
+        self._flush_task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bathala-io")
+        self._running_flush = None
+        self._queued_flush = None
+        self.timings = IO_TIMINGS
+        print(f"📂 Repository loaded {len(self.characters)} character(s).")
+
+    # --- Reads ---
+
+    def __contains__(self, user_id):
+        return user_id in self.characters
+
+    def get(self, user_id):
+        return self.characters.get(user_id)
+
+    # --- Writes ---
+
+    def add(self, user_id, character):
+        self.skills.invalidate(user_id)
+        self.characters[user_id] = character
+        self.record(character_created(user_id, character), characters=[user_id])
+
+    def remove(self, user_id):
+        self.skills.invalidate(user_id)
+        character = self.characters.pop(user_id, None)
+        if character is not None:
+            self.record(character_killed(user_id), characters=[user_id])
+        return character
+
+    def _owner(self, entity_id):
+        return self.base if entity_id == "base" else self.characters.get(entity_id)
+
+    def mark_dirty(self, *entity_ids):
+        """Mark characters (or "base") as changed so the next flush persists them."""
+        self.camp.refresh(*entity_ids)
+        if self._journal is None:
+            self._dirty.update(entity_ids)
+            return
+        for entity_id in entity_ids:
+            self._journal.append(entity_put(entity_id, self._owner(entity_id)))
+
+    def mark_inventory_dirty(self, *entity_ids):
+        """Mark only the inventories of characters (or "base") as changed."""
+        self.camp.refresh(*entity_ids)
+        if self._journal is None:
+            self._dirty_inventories.update(entity_ids)
+            return
+        for entity_id in entity_ids:
+            owner = self._owner(entity_id)
+            if owner is not None:
+                self._journal.append(inventory_put(entity_id, owner["inventory"]))
+
+    def record(self, event, characters=(), inventories=()):
+        """
+        Persist a change described by a typed event (see utils/journal.py).
+
+        Journaled backends append the event itself; the others fall back to
+        marking the given characters / inventories dirty.
+        """
+        self.camp.refresh(*characters, *inventories)
+        if self._journal is not None:
+            self._journal.append(event)
+        else:
+            self._dirty.update(characters)
+            self._dirty_inventories.update(inventories)
+
+    @property
+    def is_dirty(self):
+        return bool(self._dirty) or bool(self._dirty_inventories) or bool(self._journal)
+
+    def _take_snapshot(self):
+        """Swap out the dirty sets (or pending journal records) and capture what they refer to."""
+        character_ids, self._dirty = self._dirty, set()
+        inventory_ids, self._dirty_inventories = self._dirty_inventories - character_ids, set()
+        with self.timings.time("snapshot"):
+            if self._journal is None:
+                records = None
+                snapshot = self.storage.snapshot(self.characters, self.base, character_ids, inventory_ids)
+            else:
+                records, self._journal = self._journal, []
+                snapshot = self.storage.snapshot(self.characters, self.base, character_ids, inventory_ids, records)
+        return snapshot, (character_ids, inventory_ids, records)
+
+    def _restore_dirty(self, pending):
+        character_ids, inventory_ids, records = pending
+        self._dirty |= character_ids
+        self._dirty_inventories |= inventory_ids
+        if records:
+            self._journal[:0] = records
+
+    def flush(self):
+        """Write pending changes synchronously. Returns True if anything was written."""
+        if not self.is_dirty:
+            return False
+
+        snapshot, pending = self._take_snapshot()
+        try:
+            self.storage.write(snapshot)
+        except Exception:
+            self._restore_dirty(pending)
+            raise
+        return True
+
+    def request_flush(self):
+        """
+        Ask for pending changes to be written off the event loop.
+
+        Returns an awaitable resolving to True if anything was written. While a
+        write is in flight, every new request shares one queued follow-up
+        write instead of starting its own.
+        """
+        if self._queued_flush is None:
+            self._queued_flush = asyncio.ensure_future(self._run_flush(self._running_flush))
+        return asyncio.shield(self._queued_flush)
+
+    async def _run_flush(self, previous):
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        self._running_flush, self._queued_flush = self._queued_flush, None
+        try:
+            if not self.is_dirty:
+                return False
+
+            snapshot, pending = self._take_snapshot()
+            loop = asyncio.get_running_loop()
+            try:
+                with self.timings.time("flush"):
+                    await loop.run_in_executor(self._executor, self.storage.write, snapshot)
+            except Exception:
+                self._restore_dirty(pending)
+                raise
+            return True
+        finally:
+            if self._running_flush is asyncio.current_task():
+                self._running_flush = None
+
+    # --- Transactions ---
+
+    def _lock_for(self, entity_id):
+        lock = self._locks.get(entity_id)
+        if lock is None:
+            lock = self._locks[entity_id] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def transaction(self, *entity_ids):
+        """
+        Serialize read-modify-write work on the given characters (or "base").
+
+        Locks are taken in sorted order so two transactions over overlapping ids
+        can't deadlock, while transactions over unrelated ids run in parallel.
+        Transactions are not re-entrant: don't open one on an id you already hold.
+
+        Usage:
+            async with repo.transaction(giver_id, receiver_id):
+                ...
+        """
+        acquired = []
+        try:
+            for entity_id in sorted(set(entity_ids)):
+                lock = self._lock_for(entity_id)
+                await lock.acquire()
+                acquired.append(lock)
+            yield self
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    # --- Background flushing ---
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.request_flush()
+            except Exception as e:
+                print(f"❌ Failed to flush repository: {e}")
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.request_flush()
+        self._executor.shutdown(wait=True)
+        self.storage.close()
+        print("💾 Repository flushed on shutdown.")
+        print(self.timings.format())
@@ -2,6 +2,7 @@
 
 import discord
 import random
+from functools import lru_cache
 from utils.actions import ACTIONS
 
 BASE_DICE = 3
@@ -9,6 +10,88 @@ SUCCESS_THRESHOLD = 4
 CRIT = 6
 FAIL = 1
 
+ADD_DIE_COST = 3
+REROLL_COST = 1
+
+def die_score(die):
+    if die == CRIT:
+        return 2
+    if die >= SUCCESS_THRESHOLD:
+        return 1
+    if die == FAIL:
+        return -1
+    return 0
+
+FACES = range(1, 7)
+# {score: probability} for one fair die
+DIE_SCORE_PROBS = {}
+for _face in FACES:
+    DIE_SCORE_PROBS[die_score(_face)] = DIE_SCORE_PROBS.get(die_score(_face), 0) + 1 / 6
+MIN_DIE_SCORE = min(DIE_SCORE_PROBS)
+EXPECTED_DIE_SCORE = sum(score * p for score, p in DIE_SCORE_PROBS.items())
+
+_DISTRIBUTIONS = [(1.0,)]  # index n -> distribution for n dice
+
+def success_distribution(num_dice):
+    """
+    Exact distribution of total successes for a fresh pool of `num_dice` dice.
+
+    Returns a tuple of probabilities where index i is the chance of
+    (i + MIN_DIE_SCORE * num_dice) successes. Built by dynamic programming:
+    each pool size is the previous one convolved with a single die, and every
+    size is kept, so a table up to N costs O(N²) once.
+    """
+    num_dice = max(0, num_dice)
+    span = max(DIE_SCORE_PROBS) - MIN_DIE_SCORE
+    while len(_DISTRIBUTIONS) <= num_dice:
+        previous = _DISTRIBUTIONS[-1]
+        dist = [0.0] * (len(previous) + span)
+        for i, p in enumerate(previous):
+            if p:
+                for score, q in DIE_SCORE_PROBS.items():
+                    dist[i + score - MIN_DIE_SCORE] += p * q
+        _DISTRIBUTIONS.append(tuple(dist))
+    return _DISTRIBUTIONS[num_dice]
+
+@lru_cache(maxsize=None)
+def chance_at_least(num_dice, successes):
+    """P(a fresh pool of num_dice dice scores >= successes)."""
+    dist = success_distribution(num_dice)
+    start = max(0, successes - MIN_DIE_SCORE * num_dice)
+    return min(1.0, sum(dist[start:]))
+
+@lru_cache(maxsize=None)
+def reroll_odds(lowest_die):
+    """(expected gain, chance of improving) for rerolling a die showing lowest_die."""
+    old = die_score(lowest_die)
+    gain = EXPECTED_DIE_SCORE - old
+    improve = sum(p for score, p in DIE_SCORE_PROBS.items() if score > old)
+    return gain, improve
+
+def roll_odds(lowest_die):
+    """Expected gains of ➕ (add die) and 🔁 (reroll lowest) given the pool's lowest die."""
+    odds = {
+        "add_gain": EXPECTED_DIE_SCORE,
+        "add_gain_per_point": EXPECTED_DIE_SCORE / ADD_DIE_COST,
+        "reroll_gain": 0.0,
+        "reroll_improve": 0.0,
+        "reroll_gain_per_point": 0.0,
+    }
+    if lowest_die is not None:
+        gain, improve = reroll_odds(lowest_die)
+        odds.update(reroll_gain=gain, reroll_improve=improve, reroll_gain_per_point=gain / REROLL_COST)
+    return odds
+
+def format_odds(pool):
+    odds = roll_odds(pool.lowest())
+    num_dice, successes = len(pool), pool.successes
+    return (
+        f"➕ Add die ({ADD_DIE_COST}🧠): **{odds['add_gain']:+.2f}** expected\n"
+        f"🔁 Reroll lowest ({REROLL_COST}🧠): **{odds['reroll_gain']:+.2f}** expected, "
+        f"{odds['reroll_improve'] * 100:.0f}% to improve\n"
+        f"🎯 {chance_at_least(num_dice, successes) * 100:.0f}% of fresh {num_dice}-dice pools score {successes}+"
+    )
+
 def roll_dice_pool(num_dice):
         print(f"Rolling {num_dice} dice")
         return [random.randint(1, 6) for _ in range(num_dice)]
@@ -37,19 +120,116 @@ def reroll_lowest(rolls, history):
     history.append(old_rolls)
     print(f"Rerolled lowest: {old_rolls} → {rolls}")
     return rolls, history
+
+class DicePool:
+    """
+    Dice pool for a roll session, updated incrementally.
+
+    Keeps a running success tally and a face-count histogram (with the
+    positions of each face), so adding a die and rerolling the lowest one are
+    O(1). History is stored as (index, old, new) deltas, with old=0 for an added
+    die, and earlier states are rebuilt from the initial roll on demand.
+    """
+
+    __slots__ = ("dice", "initial", "successes", "positions", "deltas")
+
+    def __init__(self, dice):
+        self.dice = list(dice)
+        self.initial = tuple(self.dice)
+        self.successes = 0
+        self.positions = [set() for _ in range(7)]  # face -> indices showing it
+        self.deltas = []
+        for i, die in enumerate(self.dice):
+            self.positions[die].add(i)
+            self.successes += die_score(die)
+
+    @classmethod
+    def roll(cls, num_dice):
+        return cls(roll_dice_pool(num_dice))
+
+    def __len__(self):
+        return len(self.dice)
+
+    def __iter__(self):
+        return iter(self.dice)
+
+    def __repr__(self):
+        return f"DicePool({self.dice})"
+
+    def lowest(self):
+        for face in FACES:
+            if self.positions[face]:
+                return face
+        return None
+
+    def _set(self, index, new):
+        old = self.dice[index]
+        self.positions[old].discard(index)
+        self.successes -= die_score(old)
+        self.dice[index] = new
+        self.positions[new].add(index)
+        self.successes += die_score(new)
+        self.deltas.append((index, old, new))
+
+    def add_die(self, die=None):
+        die = die if die is not None else random.randint(1, 6)
+        index = len(self.dice)
+        self.dice.append(die)
+        self.positions[die].add(index)
+        self.successes += die_score(die)
+        self.deltas.append((index, 0, die))
+        return die
+
+    def reroll_lowest(self):
+        """Reroll one die showing the lowest face. Returns (index, old, new) or None."""
+        face = self.lowest()
+        if face is None:
+            return None
+        index = next(iter(self.positions[face]))
+        self._set(index, random.randint(1, 6))
+        print(f"Rerolled lowest: die {index} {face} → {self.dice[index]}")
+        return self.deltas[-1]
+
+    def state_at(self, step):
+        """The dice after the first `step` deltas were applied."""
+        dice = list(self.initial)
+        for index, old, new in self.deltas[:step]:
+            if old == 0:
+                dice.append(new)
+            else:
+                dice[index] = new
+        return dice
+
+    def previous_rolls(self):
+        """The pool as it stood right before each reroll, oldest first."""
+        states = []
+        dice = list(self.initial)
+        for index, old, new in self.deltas:
+            if old == 0:
+                dice.append(new)
+            else:
+                states.append(list(dice))
+                dice[index] = new
+        return states
+
+def format_history(pool):
+    previous = pool.previous_rolls()
+    if not previous:
+        return None
+    return "\n".join([f"• {', '.join(map(str, h))}" for h in previous])
     
-def format_roll_embed(user, action, rolls, skill_name, skill_points, history):
+def format_roll_embed(user, action, pool, skill_name, skill_points):
     print("[format_roll_embed] Called with:")
     print(f"  User: {user.display_name} (ID: {user.id})")
     print(f"  Action: {action}")
-    print(f"  Rolls: {rolls}")
+    print(f"  Rolls: {pool.dice}")
     print(f"  Skill Name: {skill_name}")
     print(f"  Skill Points: {skill_points}")
-    print(f"  History: {history}")
+    print(f"  History: {len(pool.deltas)} deltas")
 
-    success_count = calculate_successes(rolls)
+    success_count = pool.successes
 
-    roll_str = ", ".join(str(r) for r in rolls)
+    roll_str = ", ".join(str(r) for r in pool)
     print(f"  Roll String: {roll_str}")
 
     embed = discord.Embed(
@@ -61,32 +241,32 @@ def format_roll_embed(user, action, rolls, skill_name, skill_points, history):
     embed.add_field(name="Skill", value=skill_name, inline=True)
     embed.add_field(name="✅ Successes", value=success_count, inline=True)
     embed.add_field(name="🧠 Remaining Skill Points", value=skill_points, inline=True)
+    embed.add_field(name="📊 Odds", value=format_odds(pool), inline=False)
 
-    if len(history) > 1:
-        history_text = "\n".join([f"• {', '.join(map(str, h))}" for h in history[:-1]])
+    history_text = format_history(pool)
+    if history_text:
         embed.add_field(name="🕓 Previous Rolls", value=history_text, inline=False)
         print("  Added previous roll history to embed.")
 
     print("[format_roll_embed] Embed creation complete.")
     return embed
 
-def format_grouproll_embed(action, rolls, members, history, submitted):
+def format_grouproll_embed(action, pool, members, submitted):
     """
     - action: dict from ACTIONS (e.g. ACTIONS["scavenge"])
-    - rolls: shared list of ints (all player dice)
+    - pool: shared DicePool (all player dice, with its reroll history)
     - members: dict of user_id -> { "user": discord.User, "skill_points": int }
-    - history: list of past rolls (list of lists)
     - submitted: set of user_ids who have submitted
     """
     print("[format_grouproll_embed] Called")
     print(f"  Action: {action['name']}")
-    print(f"  Rolls: {rolls}")
+    print(f"  Rolls: {pool.dice}")
     print(f"  Members: {list(members.keys())}")
     print(f"  Submitted: {submitted}")
-    print(f"  History: {len(history)} entries")
+    print(f"  History: {len(pool.deltas)} deltas")
 
-    success_count = calculate_successes(rolls)
-    roll_str = ", ".join(str(r) for r in rolls)
+    success_count = pool.successes
+    roll_str = ", ".join(str(r) for r in pool)
 
     embed = discord.Embed(
         title=f"👥 Group Action: {action['name']}",
@@ -95,6 +275,7 @@ def format_grouproll_embed(action, rolls, members, history, submitted):
     )
     
     embed.add_field(name="✅ Group Successes", value=str(success_count), inline=True)
+    embed.add_field(name="📊 Odds", value=format_odds(pool), inline=False)
 
     submitted_names = []
     waiting_names = []
@@ -111,8 +292,8 @@ def format_grouproll_embed(action, rolls, members, history, submitted):
     embed.add_field(name="📤 Submitted", value="\n".join(submitted_names) or "None", inline=False)
     embed.add_field(name="⌛ Waiting", value="\n".join(waiting_names) or "None", inline=False)
 
-    if len(history) > 1:
-        history_text = "\n".join([f"• {', '.join(map(str, h))}" for h in history[:-1]])
+    history_text = format_history(pool)
+    if history_text:
         embed.add_field(name="🕓 Previous Rolls", value=history_text, inline=False)
 
     print("[format_grouproll_embed] Embed creation complete.")
@@ -0,0 +1,150 @@
+# utils/sessions.py
+
+import asyncio
+import heapq
+import itertools
+import time
+
+import discord
+
+ROLL_TTL = 10 * 60   # seconds without activity before a roll is closed
+LOBBY_TTL = 10 * 60  # seconds without activity before a lobby is closed
+MAX_REAP_SLEEP = 30  # seconds; upper bound between expiry checks
+
+# Button sessions are finalized through the last interaction's token, which
+# Discord only honours for 15 minutes, so TTLs should stay below that.
+
+
+class SessionStore:
+    """
+    Live roll/lobby sessions with a per-session time to live.
+
+    Deadlines sit in a min-heap, so finding what has expired only looks at the
+    sessions that actually expired instead of scanning everything. touch()
+    pushes a fresh deadline and leaves the old heap entry behind; stale entries
+    are skipped when they surface and the heap is rebuilt if they pile up.
+
+    Expired sessions are handed to on_expire(key, data) so the owning cog can
+    close them gracefully (e.g. edit the embed to "expired").
+    """
+
+    def __init__(self, name, ttl, on_expire=None, clock=time.monotonic):
+        self.name = name
+        self.ttl = ttl
+        self.on_expire = on_expire
+        self.clock = clock
+        self.sessions = {}   # key -> session data
+        self._deadlines = {}  # key -> current deadline
+        self._heap = []      # (deadline, seq, key), may hold stale entries
+        self._seq = itertools.count()
+        self._task = None
+        self.completed = 0
+        self.evicted = 0
+
+    def __contains__(self, key):
+        return key in self.sessions
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def get(self, key):
+        return self.sessions.get(key)
+
+    def add(self, key, data, ttl=None):
+        self.sessions[key] = data
+        self.touch(key, ttl)
+
+    def touch(self, key, ttl=None):
+        """Push a session's deadline back to now + ttl."""
+        if key not in self.sessions:
+            return
+        deadline = self.clock() + (self.ttl if ttl is None else ttl)
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+        if len(self._heap) > 4 * len(self.sessions) + 64:
+            self._compact()
+
+    def pop(self, key):
+        """Remove a finished session. Returns its data, or None if it's gone (e.g. expired)."""
+        data = self.sessions.pop(key, None)
+        self._deadlines.pop(key, None)
+        if data is not None:
+            self.completed += 1
+        return data
+
+    def _compact(self):
+        self._heap = [(deadline, next(self._seq), key) for key, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+    def next_deadline(self):
+        """The earliest live deadline, or None if there are no sessions."""
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def expire(self, now=None):
+        """Remove and return [(key, data)] for every session past its deadline."""
+        now = self.clock() if now is None else now
+        expired = []
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            expired.append((key, self.sessions.pop(key)))
+        self.evicted += len(expired)
+        return expired
+
+    @property
+    def stats(self):
+        return {"live": len(self.sessions), "completed": self.completed, "evicted": self.evicted}
+
+    # --- Background reaping ---
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._reap_loop())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _reap_loop(self):
+        while True:
+            deadline = self.next_deadline()
+            delay = MAX_REAP_SLEEP if deadline is None else min(MAX_REAP_SLEEP, max(0, deadline - self.clock()))
+            await asyncio.sleep(delay)
+
+            expired = self.expire()
+            if not expired:
+                continue
+            for key, data in expired:
+                if self.on_expire is not None:
+                    try:
+                        await self.on_expire(key, data)
+                    except Exception as e:
+                        print(f"❌ Failed to close expired {self.name} session {key}: {e}")
+            stats = self.stats
+            print(f"⌛ {self.name}: closed {len(expired)} expired session(s) "
+                  f"(live {stats['live']}, evicted {stats['evicted']}).")
+
+
+def format_expired_embed(title):
+    return discord.Embed(
+        title=f"⌛ Expired: {title}",
+        description="Nobody touched this for a while, so it was closed.",
+        color=discord.Color.dark_grey()
+    )
+
+
+async def show_expired(data, title):
+    """Edit an expired session's message to say it expired and drop its buttons."""
+    embed = format_expired_embed(title)
+    if data.get("view") is not None:
+        data["view"].stop()
+        await data["interaction"].edit_original_response(embed=embed, view=None)
+    else:
+        await data["message"].edit(embed=embed)
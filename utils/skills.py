@@ -0,0 +1,66 @@
+# utils/skills.py
+
+from utils.constants import SKILLS
+from utils.items import ITEM_REGISTRY, ITEMS
+
+SKILL_INDEX = {skill: i for i, skill in enumerate(SKILLS)}
+
+def _bonus_vector(item_data):
+    vector = [0] * len(SKILLS)
+    for skill, bonus in item_data.get("bonus", {}).items():
+        if skill in SKILL_INDEX:
+            vector[SKILL_INDEX[skill]] += bonus
+    return vector
+
+# Equipment bonuses as per-skill vectors keyed by item id, precomputed once from ITEMS.
+EQUIPMENT_BONUSES = {ITEM_REGISTRY.register(name): _bonus_vector(data) for name, data in ITEMS.items()}
+
+
+class SkillIndex:
+    """
+    Cached effective skills (base skills + equipment bonuses) per character.
+
+    Each entry is a tuple of totals across all SKILLS, stored alongside the
+    inventory's equip_version. Equipping, unequipping or moving an equipped item
+    bumps that version and the entry is rebuilt on the next lookup; skill
+    changes must call invalidate().
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._cache = {}  # user_id -> (Stash, equip_version, totals)
+
+    def totals(self, user_id):
+        """Tuple of effective skill values in SKILLS order, or None if no character."""
+        char = self.repo.get(user_id)
+        if char is None:
+            return None
+
+        inventory = char["inventory"]
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] is inventory and cached[1] == inventory.equip_version:
+            return cached[2]
+
+        totals = [char["skills"].get(skill, 0) for skill in SKILLS]
+        for item_id, count in inventory.equipped.items():
+            bonuses = EQUIPMENT_BONUSES.get(item_id)
+            if bonuses:
+                for i, bonus in enumerate(bonuses):
+                    totals[i] += bonus * count
+
+        totals = tuple(totals)
+        self._cache[user_id] = (inventory, inventory.equip_version, totals)
+        return totals
+
+    def effective(self, user_id, skill):
+        totals = self.totals(user_id)
+        if totals is None:
+            return 0
+        return totals[SKILL_INDEX[skill]]
+
+    def base(self, user_id, skill):
+        char = self.repo.get(user_id)
+        return char["skills"].get(skill, 0) if char else 0
+
+    def invalidate(self, user_id):
+        self._cache.pop(user_id, None)
@@ -0,0 +1,265 @@
+# utils/storage.py
+
+import json
+import sqlite3
+
+from utils.io import CHARACTER_DATA_PATH, entry_fragment, load_characters, write_fragments_atomic
+from utils.base import BASE_PATH, load_base, save_base
+from utils.inventory import Stash, upgrade_inventory
+from utils.hunger_thirst import upgrade_last_tick
+from utils.timings import IO_TIMINGS
+
+SQLITE_PATH = "data/bathala.db"
+
+
+def snapshot_entity(entity):
+    """
+    Copy a character or base dict into plain, JSON-ready data.
+
+    Taken on the event loop so the copy can be serialized on a worker thread
+    while commands keep mutating the live objects.
+    """
+    snapshot = {}
+    for key, value in entity.items():
+        if isinstance(value, Stash):
+            value = value.to_data()
+        elif isinstance(value, dict):
+            value = dict(value)
+        elif isinstance(value, list):
+            value = list(value)
+        snapshot[key] = value
+    return snapshot
+
+
+
+class JsonStorage:
+    """
+    Whole-file JSON storage: data/characters.json and data/base.json.
+
+    Every character's serialized JSON is cached as a fragment. A flush only
+    re-serializes the characters that changed (on the event loop), and the
+    I/O thread joins all fragments into the new file - so the loop's share of
+    a flush follows the size of the change, not the size of the camp.
+    """
+
+    def __init__(self, characters_path=CHARACTER_DATA_PATH, base_path=BASE_PATH, cache_fragments=True):
+        self.characters_path = characters_path
+        self.base_path = base_path
+        self.cache_fragments = cache_fragments  # False when only used to load (utils/journal.py)
+        self._fragments = {}  # char_id -> entry_fragment of the character
+
+    def load(self):
+        with IO_TIMINGS.time("load"):
+            characters = load_characters(self.characters_path)
+            base = load_base(self.base_path)
+        for char in characters.values():
+            upgrade_inventory(char)
+            upgrade_last_tick(char)
+        upgrade_inventory(base)
+        if self.cache_fragments:
+            self._fragments = {char_id: entry_fragment(char) for char_id, char in characters.items()}
+        return characters, base
+
+    def save(self, characters, base, character_ids=(), inventory_ids=()):
+        self.write(self.snapshot(characters, base, character_ids, inventory_ids))
+
+    def snapshot(self, characters, base, character_ids=(), inventory_ids=()):
+        """
+        Capture what needs writing.
+
+        JSON files can't be updated in place, so any changed character rewrites
+        characters.json and a changed base rewrites base.json. Only the changed
+        characters are serialized here; the rest reuse their cached fragments.
+        """
+        changed = set(character_ids) | set(inventory_ids)
+        fragments = None
+        if changed - {"base"}:
+            for char_id in changed - {"base"}:
+                char = characters.get(char_id)
+                if char is None:
+                    self._fragments.pop(char_id, None)
+                else:
+                    self._fragments[char_id] = entry_fragment(char)
+            if len(self._fragments) != len(characters):
+                self._sync_fragments(characters)
+            fragments = self._fragments.copy()  # fragments are immutable strings, so a shallow copy is safe
+        return {
+            "character_fragments": fragments,
+            "base": snapshot_entity(base) if "base" in changed else None,
+        }
+
+    def _sync_fragments(self, characters):
+        """Cover characters this storage never loaded or saw marked (e.g. a fresh file)."""
+        for char_id in set(self._fragments) - set(characters):
+            del self._fragments[char_id]
+        for char_id, char in characters.items():
+            if char_id not in self._fragments:
+                self._fragments[char_id] = entry_fragment(char)
+
+    def write(self, snapshot):
+        """Serialize and write a snapshot. Safe to run on a worker thread."""
+        if snapshot["character_fragments"] is not None:
+            with IO_TIMINGS.time("save_characters"):
+                write_fragments_atomic(self.characters_path, snapshot["character_fragments"])
+        if snapshot["base"] is not None:
+            with IO_TIMINGS.time("save_base"):
+                save_base(snapshot["base"], self.base_path)
+
+    def close(self):
+        pass
+
+
+class SqliteStorage:
+    """
+    Row-per-entity SQLite storage.
+
+    Each character is one row in `characters` (everything except the inventory)
+    and each inventory is one row in `inventories`, keyed by character id or
+    "base". A flush after /give or /store touches only the affected rows, all
+    inside a single transaction.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS characters (
+            id   TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS inventories (
+            owner_id TEXT PRIMARY KEY,
+            items    TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS base (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def load(self):
+        with IO_TIMINGS.time("load"):
+            return self._load()
+
+    def _load(self):
+        inventories = {
+            owner_id: Stash.from_data(json.loads(items))
+            for owner_id, items in self.conn.execute("SELECT owner_id, items FROM inventories")
+        }
+
+        characters = {}
+        for char_id, data in self.conn.execute("SELECT id, data FROM characters"):
+            char = upgrade_last_tick(json.loads(data))
+            char["inventory"] = inventories.get(char_id) or Stash()
+            characters[char_id] = char
+
+        base = {key: json.loads(value) for key, value in self.conn.execute("SELECT key, value FROM base")}
+        base["inventory"] = inventories.get("base") or Stash()
+        return characters, base
+
+    def save(self, characters, base, character_ids=(), inventory_ids=()):
+        self.write(self.snapshot(characters, base, character_ids, inventory_ids))
+
+    def snapshot(self, characters, base, character_ids=(), inventory_ids=()):
+        """
+        Capture the changed rows.
+
+        character_ids rewrite the whole character (row + inventory); inventory_ids
+        only rewrite inventory rows. Ids no longer present in `characters` are
+        deleted.
+        """
+        entities = {}
+        inventories = {}
+        for char_id in character_ids:
+            owner = base if char_id == "base" else characters.get(char_id)
+            entities[char_id] = snapshot_entity(owner) if owner is not None else None
+        for owner_id in inventory_ids:
+            owner = base if owner_id == "base" else characters.get(owner_id)
+            if owner is not None:
+                inventories[owner_id] = Stash.from_data(owner.get("inventory")).to_data()
+        return {"entities": entities, "inventories": inventories}
+
+    def write(self, snapshot):
+        """Write a snapshot in one transaction. Safe to run on a worker thread."""
+        with IO_TIMINGS.time("save_rows"), self.conn:
+            for char_id, char in snapshot["entities"].items():
+                if char_id == "base":
+                    self._write_base(char)
+                elif char is None:
+                    self.conn.execute("DELETE FROM characters WHERE id = ?", (char_id,))
+                    self.conn.execute("DELETE FROM inventories WHERE owner_id = ?", (char_id,))
+                else:
+                    self._write_character(char_id, char)
+
+            for owner_id, inventory in snapshot["inventories"].items():
+                self._write_inventory(owner_id, inventory)
+
+    def write_all(self, characters, base):
+        """Replace the whole database contents in one transaction."""
+        with self.conn:
+            self.conn.execute("DELETE FROM characters")
+            self.conn.execute("DELETE FROM inventories")
+            self.conn.execute("DELETE FROM base")
+            for char_id, char in characters.items():
+                self._write_character(char_id, char)
+            self._write_base(base)
+
+    def _write_character(self, char_id, char):
+        row = {k: v for k, v in char.items() if k != "inventory"}
+        self.conn.execute(
+            "INSERT OR REPLACE INTO characters (id, data) VALUES (?, ?)",
+            (char_id, json.dumps(row))
+        )
+        self._write_inventory(char_id, char.get("inventory"))
+
+    def _write_inventory(self, owner_id, inventory):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO inventories (owner_id, items) VALUES (?, ?)",
+            (owner_id, json.dumps(Stash.from_data(inventory).to_data()))
+        )
+
+    def _write_base(self, base):
+        for key, value in base.items():
+            if key == "inventory":
+                continue
+            self.conn.execute(
+                "INSERT OR REPLACE INTO base (key, value) VALUES (?, ?)",
+                (key, json.dumps(value))
+            )
+        self._write_inventory("base", base.get("inventory"))
+
+    def close(self):
+        self.conn.close()
+
+
+STORAGE_BACKENDS = {
+    "json": JsonStorage,
+    "sqlite": SqliteStorage,
+}
+
+def open_storage(backend="json"):
+    if backend == "journal":
+        from utils.journal import JournalStorage  # utils/journal.py builds on this module
+        return JournalStorage()
+    if backend not in STORAGE_BACKENDS:
+        choices = ", ".join([*STORAGE_BACKENDS, "journal"])
+        raise ValueError(f"Unknown storage backend '{backend}'. Choose from: {choices}")
+    return STORAGE_BACKENDS[backend]()
+
+
+def migrate_json_to_sqlite(json_storage=None, sqlite_storage=None):
+    """
+    One-shot migration of data/*.json into SQLite.
+
+    Returns the number of characters migrated.
+    """
+    json_storage = json_storage or JsonStorage()
+    sqlite_storage = sqlite_storage or SqliteStorage()
+
+    characters, base = json_storage.load()
+    sqlite_storage.write_all(characters, base)
+    return len(characters)
@@ -0,0 +1,54 @@
+# utils/timings.py
+
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MAX_SAMPLES = 1000  # most recent samples kept per operation
+
+
+class Timings:
+    """Rolling latency samples per operation name, reported as p50/p99 in ms."""
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.samples = {}  # op -> deque of seconds
+
+    def record(self, op, seconds):
+        samples = self.samples.get(op)
+        if samples is None:
+            samples = self.samples[op] = deque(maxlen=self.max_samples)
+        samples.append(seconds)
+
+    @contextmanager
+    def time(self, op):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(op, time.perf_counter() - start)
+
+    def percentiles(self, op):
+        """{"count", "p50", "p99"} for one operation, in milliseconds."""
+        ordered = sorted(self.samples.get(op, ()))
+        if not ordered:
+            return {"count": 0, "p50": 0.0, "p99": 0.0}
+
+        def pick(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+        return {"count": len(ordered), "p50": round(pick(0.50), 3), "p99": round(pick(0.99), 3)}
+
+    def summary(self):
+        return {op: self.percentiles(op) for op in sorted(self.samples)}
+
+    def format(self):
+        lines = [
+            f"{op:<18} n={stats['count']:<5} p50={stats['p50']:.2f}ms p99={stats['p99']:.2f}ms"
+            for op, stats in self.summary().items()
+        ]
+        return "\n".join(lines) or "No samples yet."
+
+
+# Shared by the storage layer and the repository.
+IO_TIMINGS = Timings()